@@ -7,11 +7,36 @@ Provides a file system model where items start checked by default,
 and users can uncheck items to exclude them from scanning.
 """
 
+import os
+import sys
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
 
-from PySide6.QtCore import QModelIndex, Qt, Signal
+from PySide6.QtCore import QModelIndex, QPersistentModelIndex, Qt, QTimer, Signal
 from PySide6.QtWidgets import QFileSystemModel
 
+# Upper bound on memoized path normalizations before the cache is reset.
+_NORM_CACHE_MAX = 65536
+# Same for memoized check states (one per row painted since the last
+# exclusion change).
+_STATE_CACHE_MAX = 65536
+
+# Qt enum members bound once. data() and flags() run for every role of
+# every visible cell on each repaint, and PySide6's unscoped shortcuts
+# (Qt.CheckStateRole, Qt.Checked, ...) cost a few microseconds per lookup.
+_CHECK_STATE_ROLE = Qt.ItemDataRole.CheckStateRole
+_CHECKED = Qt.CheckState.Checked
+_UNCHECKED = Qt.CheckState.Unchecked
+_USER_CHECKABLE = Qt.ItemFlag.ItemIsUserCheckable
+
+# Trie node key marking an explicitly excluded path. A sentinel object can't
+# collide with a real path component.
+_EXCLUDED = object()
+
+# Trie node standing in for "nothing excluded below here" during walks.
+_NO_EXCLUSIONS: dict = {}
+
 
 class CheckableFsModel(QFileSystemModel):
     """
@@ -32,154 +57,377 @@ class CheckableFsModel(QFileSystemModel):
     - Only stores explicitly unchecked items (exceptions to the rule)
     - Children inherit parent's state automatically
     - Fast even for huge directories like C:\\
+
+    Exclusions live in a path-component trie, so "is this path or any of
+    its ancestors excluded" is a single O(depth) descent, and checking a
+    folder drops its whole excluded subtree at once. ``_unchecked`` mirrors
+    the trie as a flat dict from normalized key to the path as the user
+    sees it, for listing.
     """
     exclusionsChanged = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._unchecked: set[str] = set()  # Paths that are explicitly UNCHECKED
+        # Paths that are explicitly UNCHECKED: normalized key -> display path
+        self._unchecked: dict[str, str] = {}
+        # Nested {component: {component: ...}} dicts; a node holding the
+        # _EXCLUDED key marks that path (its value is the full path string).
+        self._excl_trie: dict = {}
+        # Memoized (normalized path, interned component tuple) keyed by the
+        # raw input string. data() asks for the check state of every visible
+        # row on every repaint, so even cheap normalization and splitting
+        # add up per row and per ancestor.
+        self._norm_cache: dict[str, tuple[str, tuple[str, ...]]] = {}
+        # Resolved check state per raw filePath(). It depends only on the
+        # path and the exclusions, which change only through this model, so
+        # every mutation drops the cache.
+        self._state_cache: dict[str, Qt.CheckState] = {}
+        # Sorted snapshot of _unchecked for get_exclusion_list; None = stale
+        self._sorted_cache: list[str] | None = None
+        # exclusionsChanged coalescing for bulk mutations (batch_exclusions)
+        self._batch_depth = 0
+        self._batch_dirty = False
+        # Folders toggled since the last event-loop tick whose loaded
+        # children still need a repaint (see _schedule_refresh)
+        self._pending_refresh: set[QPersistentModelIndex] = set()
         try:
             self.setOption(QFileSystemModel.DontWatchForChanges, False)
         except Exception:
             pass
 
-    def _normalize_path(self, path: str) -> str:
-        """Normalize path for consistent comparison (resolve symlinks, fix separators)"""
+    @staticmethod
+    def _lexical_normalize(path: str) -> str:
+        """Canonical string form of *path* without touching the filesystem.
+
+        Collapses ``.``/``..`` and redundant separators and folds case where
+        the OS does. Every path the model compares comes from the same
+        QFileSystemModel root, so this is enough for exclusion membership
+        checks.
+        """
+        return os.path.normcase(os.path.normpath(path))
+
+    @staticmethod
+    def _tuplize(norm_path: str) -> tuple[str, ...]:
+        """Split a normalized path into interned, non-empty components.
+
+        Interning makes the trie's dict lookups hit the identity fast path
+        when comparing keys.
+        """
+        return tuple(sys.intern(part) for part in norm_path.split(os.sep) if part)
+
+    def _path_key(self, path: str) -> tuple[str, tuple[str, ...]]:
+        """Memoized ``(normalized path, component tuple)`` for *path*.
+
+        Keyed by the caller's raw string, so Qt's own ``filePath()`` output
+        can be passed straight in.
+        """
+        v = self._norm_cache.get(path)
+        if v is not None:
+            return v
+        norm = self._lexical_normalize(path)
+        v = (norm, self._tuplize(norm))
+        if len(self._norm_cache) >= _NORM_CACHE_MAX:
+            self._norm_cache.clear()
+        self._norm_cache[path] = v
+        return v
+
+    # ─── Exclusion trie ──────────────────────────────────────────────────
+
+    def _add_exclusion(self, path: str) -> bool:
+        """Mark *path* as excluded. Returns False if it already was."""
+        norm_path, parts = self._path_key(path)
+        if norm_path in self._unchecked:
+            return False
+        node = self._excl_trie
+        for part in parts:
+            node = node.setdefault(part, {})
+        node[_EXCLUDED] = norm_path
+        # normcase lowercases (and flips separators) on Windows; list the
+        # path in its original case
+        self._unchecked[norm_path] = os.path.normpath(path)
+        self._state_cache.clear()
+        self._sorted_cache = None
+        return True
+
+    def _discard_exclusion(self, path: str) -> None:
+        """Unmark *path* (its descendants keep their own marks)."""
+        norm_path, parts = self._path_key(path)
+        if norm_path not in self._unchecked:
+            return
+        del self._unchecked[norm_path]
+        self._state_cache.clear()
+        self._sorted_cache = None
+        node = self._excl_trie
+        for part in parts:
+            node = node.get(part)
+            if node is None:
+                return
+        node.pop(_EXCLUDED, None)
+
+    def _is_under_exclusion(self, path: str) -> bool:
+        """True if *path* or any of its ancestors is excluded."""
+        return self._parts_under_exclusion(self._path_key(path)[1])
+
+    def _parts_under_exclusion(self, parts: tuple[str, ...]) -> bool:
+        node = self._excl_trie
+        if _EXCLUDED in node:
+            return True
+        for part in parts:
+            node = node.get(part)
+            if node is None:
+                return False
+            if _EXCLUDED in node:
+                return True
+        return False
+
+    @contextmanager
+    def batch_exclusions(self):
+        """Coalesce exclusionsChanged from a burst of mutations into one emit.
+
+        Nests; the signal fires once when the outermost block exits, and
+        only if something inside it changed the exclusion set.
+        """
+        self._batch_depth += 1
         try:
-            return str(Path(path).resolve())
-        except:
-            return path
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_dirty:
+                self._batch_dirty = False
+                self.exclusionsChanged.emit()
+
+    def _notify_exclusions_changed(self):
+        if self._batch_depth:
+            self._batch_dirty = True
+        else:
+            self.exclusionsChanged.emit()
+
+    def clear_exclusions(self) -> None:
+        """Check everything again (bypasses setData; views are not refreshed)."""
+        self._unchecked.clear()
+        self._excl_trie.clear()
+        self._state_cache.clear()
+        self._sorted_cache = None
+        self._notify_exclusions_changed()
+
+    def add_exclusion(self, path: str) -> bool:
+        """Exclude *path* without going through setData.
+
+        Intended for bulk operations (wrap them in :meth:`batch_exclusions`);
+        returns False if *path* was already excluded.
+        """
+        added = self._add_exclusion(path)
+        if added:
+            self._notify_exclusions_changed()
+        return added
 
     def flags(self, index: QModelIndex):
         f = super().flags(index)
         if index.column() == 0:
-            f |= Qt.ItemIsUserCheckable
+            f |= _USER_CHECKABLE
         return f
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
-        if role == Qt.CheckStateRole and index.column() == 0:
-            path = self._normalize_path(self.filePath(index))
-
-            # Check if this item itself is explicitly unchecked
-            if path in self._unchecked:
-                return Qt.Unchecked
-
-            # Check if any parent directory is unchecked
-            # If parent is unchecked, children should be unchecked too
-            try:
-                p = Path(path)
-                for parent in p.parents:
-                    parent_str = self._normalize_path(str(parent))
-                    if parent_str in self._unchecked:
-                        return Qt.Unchecked
-            except (ValueError, OSError):
-                pass
-
-            # Default is CHECKED
-            return Qt.Checked
+        if role == _CHECK_STATE_ROLE and index.column() == 0:
+            # Common case: nothing excluded, so everything is checked
+            if not self._unchecked:
+                return _CHECKED
+
+            raw = self.filePath(index)
+            state = self._state_cache.get(raw)
+            if state is not None:
+                return state
+
+            # Unchecked if this item or any parent directory is unchecked
+            # (children inherit their parent's unchecked state).
+            # Default is CHECKED.
+            if self._is_under_exclusion(raw):
+                state = _UNCHECKED
+            else:
+                state = _CHECKED
+            if len(self._state_cache) >= _STATE_CACHE_MAX:
+                self._state_cache.clear()
+            self._state_cache[raw] = state
+            return state
         return super().data(index, role)
 
     def setData(self, index: QModelIndex, value, role: int = Qt.EditRole):
-        if role == Qt.CheckStateRole and index.column() == 0:
-            path = self._normalize_path(self.filePath(index))
+        if role == _CHECK_STATE_ROLE and index.column() == 0:
+            # Raw Qt form; the exclusion primitives normalize (memoized)
+            path = self.filePath(index)
             if not path:
                 return False
 
             state = Qt.CheckState(value)
 
-            if state == Qt.Unchecked:
-                # User UNCHECKED this item
-                self._unchecked.add(path)
+            with self.batch_exclusions():
+                if state == _UNCHECKED:
+                    # User UNCHECKED this item
+                    self._add_exclusion(path)
 
-                # If it's a folder, update visible children for immediate visual feedback
-                if self.isDir(index):
-                    self._update_visible_children(index)
+                    # If it's a folder, update visible children for immediate visual feedback
+                    if self.isDir(index):
+                        self._schedule_refresh(index)
 
-            else:
-                # User CHECKED this item
-                self._unchecked.discard(path)
+                else:
+                    # User CHECKED this item
+                    self._discard_exclusion(path)
 
-                # If it's a folder, remove any descendants from exclusion list
-                # This allows children to be checked when parent is checked
-                if self.isDir(index):
-                    self._remove_descendants_from_exclusions(path)
-                    self._update_visible_children(index)
+                    # If it's a folder, remove any descendants from exclusion list
+                    # This allows children to be checked when parent is checked
+                    if self.isDir(index):
+                        self._remove_descendants_from_exclusions(path, quiet=True)
+                        self._schedule_refresh(index)
 
-            # Emit signals to update UI
-            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
-            self.exclusionsChanged.emit()
+                # Emit signals to update UI (exclusionsChanged fires once,
+                # when the batch closes)
+                self.dataChanged.emit(index, index, [_CHECK_STATE_ROLE])
+                self._notify_exclusions_changed()
 
             return True
         return super().setData(index, value, role)
 
-    def _remove_descendants_from_exclusions(self, dir_path: str):
+    def _remove_descendants_from_exclusions(self, dir_path: str, quiet: bool = False):
         """
         Remove all descendants of dir_path from the exclusion list.
         When you check a folder, all children should be checked too.
-        """
-        dir_p = Path(dir_path)
-        to_remove = set()
-
-        # Find all exclusions that are children of this directory
-        for excluded_path in self._unchecked:
-            try:
-                p = Path(excluded_path)
-                # Check if this excluded path is under the directory we just checked
-                if p != dir_p and p.is_relative_to(dir_p):
-                    to_remove.add(excluded_path)
-            except (ValueError, OSError):
-                pass
 
-        # Remove them all
-        self._unchecked -= to_remove
+        With quiet=True the caller is responsible for announcing the change
+        (setData does, once, for the whole toggle).
+        """
+        node = self._excl_trie
+        for part in self._path_key(dir_path)[1]:
+            node = node.get(part)
+            if node is None:
+                return  # Nothing excluded below this directory
+        had_descendants = any(key is not _EXCLUDED for key in node)
+
+        # Collect every marked path in the subtree, then drop the subtree
+        own_mark = node.get(_EXCLUDED)
+        stack = [child for key, child in node.items() if key is not _EXCLUDED]
+        while stack:
+            sub = stack.pop()
+            for key, child in sub.items():
+                if key is _EXCLUDED:
+                    self._unchecked.pop(child, None)
+                else:
+                    stack.append(child)
+
+        node.clear()
+        if own_mark is not None:
+            node[_EXCLUDED] = own_mark
+        self._state_cache.clear()
+        self._sorted_cache = None
+        if had_descendants and not quiet:
+            self._notify_exclusions_changed()
+
+    def _schedule_refresh(self, index: QModelIndex):
+        """Queue a children refresh for *index* on the next event-loop tick.
+
+        A burst of toggles (e.g. clicking down a column of folders) then
+        costs one walk per distinct folder instead of one per click, and
+        the walk sees the final exclusion state.
+        """
+        first = not self._pending_refresh
+        self._pending_refresh.add(QPersistentModelIndex(index))
+        if first:
+            QTimer.singleShot(0, self._flush_refresh)
+
+    def _flush_refresh(self):
+        pending, self._pending_refresh = self._pending_refresh, set()
+        for pidx in pending:
+            # Rows may have been removed since the toggle was queued
+            if pidx.isValid():
+                self._update_visible_children(QModelIndex(pidx))
 
     def _update_visible_children(self, parent_index: QModelIndex):
         """
-        Update visual checkstate of all loaded children recursively.
+        Update visual checkstate of all loaded descendants of parent_index.
         Forces a visual refresh so children immediately show the inherited state.
+
+        Walks loaded folders breadth-first with a deque (no recursion, so
+        deep trees can't hit the recursion limit) and emits one
+        dataChanged covering rows 0..n-1 per folder rather than one per
+        child.
         """
         if not parent_index.isValid():
             return
 
-        row_count = self.rowCount(parent_index)
-
-        for row in range(row_count):
-            child_index = self.index(row, 0, parent_index)
-            if not child_index.isValid():
+        queue = deque([parent_index])
+        while queue:
+            parent = queue.popleft()
+            row_count = self.rowCount(parent)
+            if row_count == 0:
                 continue
 
-            # Emit dataChanged to trigger visual update
-            self.dataChanged.emit(child_index, child_index, [Qt.CheckStateRole])
+            first = self.index(0, 0, parent)
+            last = self.index(row_count - 1, 0, parent)
+            self.dataChanged.emit(first, last, [_CHECK_STATE_ROLE])
 
-            # Recursively update all loaded descendants
-            if self.isDir(child_index) and self.hasChildren(child_index):
-                # Only recurse if children are loaded
-                if self.rowCount(child_index) > 0:
-                    self._update_visible_children(child_index)
+            # Only descend into folders whose children are already loaded
+            for row in range(row_count):
+                child = self.index(row, 0, parent)
+                if self.isDir(child) and self.rowCount(child) > 0:
+                    queue.append(child)
 
     def get_exclusion_list(self) -> list[str]:
-        """Get list of excluded paths (what NOT to scan)"""
-        return sorted(self._unchecked)
+        """Get list of excluded paths (what NOT to scan)
 
-    def is_excluded(self, file_path: Path) -> bool:
+        Re-sorted only after the exclusion set changes; callers share the
+        returned list and must not mutate it.
         """
-        Check if a file should be excluded from scanning.
-        Returns True if the file or any of its parents are in the exclusion list.
+        if self._sorted_cache is None:
+            self._sorted_cache = sorted(self._unchecked.values())
+        return self._sorted_cache
+
+    def iter_included_files(self, root: str):
+        """Yield a Path for every file under *root* that is not excluded.
+
+        Depth-first os.scandir walk in os.walk's top-down order. DirEntry
+        answers is_dir()/is_symlink() from the directory listing, and
+        excluded directories are pruned before they are opened. Like
+        os.walk, symlinked directories are listed but not followed, and
+        unreadable directories are skipped. Only regular files (or links
+        to them) are yielded: FIFOs, sockets and device nodes have nothing
+        to scan and can block the read forever.
+
+        Each directory is paired with its node in the exclusion trie, so an
+        entry is checked with one lookup of its (case-folded) name rather
+        than by normalizing its full path and descending from the top.
         """
-        file_str = self._normalize_path(str(file_path))
-
-        # Check if file itself is excluded
-        if file_str in self._unchecked:
-            return True
-
-        # Check if any parent directory is excluded
-        for parent in file_path.parents:
-            parent_str = self._normalize_path(str(parent))
-            if parent_str in self._unchecked:
-                return True
-
-        return False
-
-    def has_exclusions(self) -> bool:
-        """Check if any items are excluded"""
-        return bool(self._unchecked)
+        node = self._excl_trie
+        if _EXCLUDED in node:
+            return
+        for part in self._path_key(root)[1]:
+            node = node.get(part)
+            if node is None:
+                node = _NO_EXCLUSIONS
+                break
+            if _EXCLUDED in node:
+                return
+
+        normcase = os.path.normcase
+        stack = [(root, node)]
+        while stack:
+            dir_path, node = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            subdirs = []
+            for entry in entries:
+                child = node.get(normcase(entry.name)) if node else None
+                if child is not None and _EXCLUDED in child:
+                    continue
+                try:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirs.append((entry.path, child or _NO_EXCLUSIONS))
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                yield Path(entry.path)
+            stack.extend(reversed(subdirs))
@@ -128,7 +128,17 @@ class EditorTabWidget(QTabWidget):
             self._setup_lsp_change_debounce(editor)
 
         if text:
-            editor.setPlainText(text)
+            # Bulk-load with the highlighter detached and editor signals
+            # blocked: re-attaching queues a single deferred rehighlight,
+            # which runs after the caller has picked AST mode for the size
+            highlighter.setDocument(None)
+            editor.blockSignals(True)
+            try:
+                editor.setPlainText(text)
+            finally:
+                editor.blockSignals(False)
+            highlighter.setDocument(editor.document())
+            editor._refresh_gutter()
 
         idx = self.addTab(editor, title)
         self.setCurrentIndex(idx)
@@ -0,0 +1,191 @@
+# This Python file uses the following encoding: utf-8
+
+"""
+FileTableModel - flat File/Size/Ext table for scan hits and misses.
+
+Rows are kept as parallel lists (one per field) instead of a
+QStandardItem per cell, so a scan with 100k results costs a few Python
+lists rather than hundreds of thousands of item objects. Display text,
+tooltips and alignment are derived in data() on demand. The last
+tooltip line can be stored raw and formatted only when hovered (see
+detail_formatter).
+
+A model can also page rows in from a source sequence (see
+set_lazy_source): rows are only built as the view scrolls towards the
+end, via Qt's canFetchMore/fetchMore.
+"""
+
+import os
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from scanner import format_size
+
+# (display name, file name, filepath, file size, extension, tooltip detail)
+FileRow = Tuple[str, str, str, int, str, Any]
+
+_HEADERS = ('File', 'Size', 'Ext')
+_FETCH_BATCH = 200
+_SIZE_ALIGNMENT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+
+_DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+_USER_ROLE = Qt.ItemDataRole.UserRole
+_TOOLTIP_ROLE = Qt.ItemDataRole.ToolTipRole
+_ALIGNMENT_ROLE = Qt.ItemDataRole.TextAlignmentRole
+# Views also ask for font, colour, decoration, check state, size hint...
+_ANSWERED_ROLES = frozenset((_DISPLAY_ROLE, _USER_ROLE, _TOOLTIP_ROLE, _ALIGNMENT_ROLE))
+
+
+class FileTableModel(QAbstractTableModel):
+    """Read-only File/Size/Ext table backed by parallel lists.
+
+    UserRole on column 0 is the file path and on column 1 the raw byte
+    size, matching what the QStandardItemModel version stored.
+
+    With *detail_formatter* set, the tooltip detail of each row is kept
+    as given and only turned into text when a tooltip is requested.
+    """
+
+    def __init__(self, parent=None,
+                 detail_formatter: Optional[Callable[[Any], str]] = None):
+        super().__init__(parent)
+        self._names: List[str] = []      # display text, e.g. "⚠ evil.exe"
+        self._filenames: List[str] = []  # bare file name, for the tooltip
+        self._paths: List[str] = []
+        self._sizes: List[int] = []
+        self._exts: List[str] = []
+        self._details: List[Any] = []    # last tooltip line (or its raw data)
+        self._detail_formatter = detail_formatter
+        # Lazy paging (set_lazy_source): rows source[:_loaded] are built
+        self._source: Sequence[Any] = ()
+        self._row_builder: Optional[Callable[[Any], FileRow]] = None
+        self._loaded = 0
+
+    # ─── Qt model interface ──────────────────────────────────────────────
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._paths)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(_HEADERS)
+
+    def data(self, index: QModelIndex, role: int = _DISPLAY_ROLE):
+        if role not in _ANSWERED_ROLES or not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+
+        if role == _DISPLAY_ROLE:
+            if col == 0:
+                return self._names[row]
+            if col == 1:
+                return format_size(self._sizes[row])
+            return self._exts[row]
+        if role == _USER_ROLE:
+            if col == 0:
+                return self._paths[row]
+            if col == 1:
+                return self._sizes[row]
+            return None
+        if role == _TOOLTIP_ROLE and col == 0:
+            detail = self._details[row]
+            if self._detail_formatter is not None:
+                detail = self._detail_formatter(detail)
+            return (f"File: {self._filenames[row]}\nPath: {self._paths[row]}\n"
+                    f"{detail}")
+        if role == _ALIGNMENT_ROLE and col == 1:
+            return _SIZE_ALIGNMENT
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = _DISPLAY_ROLE):
+        if (role == _DISPLAY_ROLE
+                and orientation == Qt.Orientation.Horizontal
+                and 0 <= section < len(_HEADERS)):
+            return _HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if parent.isValid() or self._row_builder is None:
+            return False
+        return self._loaded < len(self._source)
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if not self.canFetchMore(parent):
+            return
+        self._fetch_until(self._loaded + _FETCH_BATCH)
+
+    # ─── Population ──────────────────────────────────────────────────────
+
+    @staticmethod
+    def make_row(display: str, filename: str, filepath: str,
+                 file_size: int, detail: Any) -> FileRow:
+        """Build one row tuple; the extension is derived from *filename*."""
+        ext = os.path.splitext(filename)[1].lower()
+        if ext == '.':
+            ext = ''
+        return display, filename, filepath, file_size, ext, detail
+
+    def append_rows(self, rows: Iterable[FileRow]) -> None:
+        """Append rows built by :meth:`make_row` in a single insert."""
+        rows = list(rows)
+        if not rows:
+            return
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for display, filename, filepath, file_size, ext, detail in rows:
+            self._names.append(display)
+            self._filenames.append(filename)
+            self._paths.append(filepath)
+            self._sizes.append(file_size)
+            self._exts.append(ext)
+            self._details.append(detail)
+        self.endInsertRows()
+
+    def set_lazy_source(self, source: Sequence[Any],
+                        row_builder: Callable[[Any], FileRow]) -> None:
+        """Show *source* (kept by reference) one page at a time.
+
+        *row_builder* turns one source item into a :meth:`make_row` tuple;
+        it only runs for items the view has actually fetched.
+        """
+        self.clear()
+        self._source = source
+        self._row_builder = row_builder
+        self.fetchMore()
+
+    def fetch_all(self) -> None:
+        """Build every remaining lazy row (e.g. before filtering).
+
+        The rest of the source goes in as one insert, so a filter proxy
+        on top re-evaluates once rather than once per page.
+        """
+        if self.canFetchMore():
+            self._fetch_until(len(self._source))
+
+    def _fetch_until(self, end: int) -> None:
+        start = self._loaded
+        self._loaded = min(end, len(self._source))
+        build = self._row_builder
+        self.append_rows(build(item) for item in self._source[start:self._loaded])
+
+    def clear(self) -> None:
+        self._source = ()
+        self._row_builder = None
+        self._loaded = 0
+        self.beginResetModel()
+        self._names.clear()
+        self._filenames.clear()
+        self._paths.clear()
+        self._sizes.clear()
+        self._exts.clear()
+        self._details.clear()
+        self.endResetModel()
+
+    # ─── Row accessors ───────────────────────────────────────────────────
+
+    def filepath(self, row: int) -> Optional[str]:
+        """File path of source *row*, or None if out of range."""
+        if 0 <= row < len(self._paths):
+            return self._paths[row]
+        return None
@@ -21,6 +21,8 @@ from .hex_data_buffer import HexDataBuffer
 from .hex_widget import HexWidget
 from .binary_diff import BinaryDiffModel
 
+_ICON_PATH = Path(__file__).parent.parent / "assets" / "YaraXGUI.ico"
+
 
 class BinaryDiffWindow(QMainWindow):
     """Compare two files side by side with byte-level diff highlighting."""
@@ -31,9 +33,8 @@ class BinaryDiffWindow(QMainWindow):
         self.resize(1500, 800)
         self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose, True)
 
-        icon_path = Path(__file__).parent.parent / "assets" / "YaraXGUI.ico"
-        if icon_path.exists():
-            self.setWindowIcon(QIcon(str(icon_path)))
+        if _ICON_PATH.exists():
+            self.setWindowIcon(QIcon(str(_ICON_PATH)))
 
         self._theme_manager = theme_manager
         self._buf_left = HexDataBuffer()
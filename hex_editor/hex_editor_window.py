@@ -38,6 +38,8 @@ from .transform_log import TransformLogWidget, TransformLogEntry
 from .binary_diff_window import BinaryDiffWindow
 from .edit_log_widget import EditLogWidget
 
+_ICON_PATH = Path(__file__).parent.parent / "assets" / "YaraXGUI.ico"
+
 
 # ── Formatting helpers (pure functions) ────────────────────────────
 
@@ -137,9 +139,8 @@ class HexEditorWindow(QMainWindow):
         self._file_list: list[str] = []
         self._file_index: int = -1
 
-        icon_path = Path(__file__).parent.parent / "assets" / "YaraXGUI.ico"
-        if icon_path.exists():
-            self.setWindowIcon(QIcon(str(icon_path)))
+        if _ICON_PATH.exists():
+            self.setWindowIcon(QIcon(str(_ICON_PATH)))
 
         self._theme_manager = theme_manager
         self._buffer = HexDataBuffer()
@@ -1103,8 +1104,9 @@ class HexEditorWindow(QMainWindow):
     def set_match_data(self, matched_rules: list, file_data: bytes = b""):
         """Populate the YARA Matches dock with per-pattern hit rows.
 
-        *matched_rules* is the list from a scan hit dict.  Each entry
-        has ``identifier``, ``patterns`` → ``matches`` with offset/length.
+        *matched_rules* is the list of ``RuleMatch`` records from a scan
+        hit dict.  Each has ``identifier``, ``patterns`` → ``matches`` with
+        offset/length attributes.
         *file_data* is the raw file bytes for generating data previews.
         """
         self._match_table.setRowCount(0)
@@ -1114,12 +1116,12 @@ class HexEditorWindow(QMainWindow):
 
         rows: list[tuple[str, str, int, int, str]] = []
         for rule in matched_rules:
-            rule_name = rule.get("identifier", "?")
-            for pat in rule.get("patterns", []):
-                pat_id = pat.get("identifier", "?")
-                for m in pat.get("matches", []):
-                    offset = m.get("offset", 0)
-                    length = m.get("length", 0)
+            rule_name = rule.identifier
+            for pat in rule.patterns:
+                pat_id = pat.identifier
+                for m in pat.matches:
+                    offset = m.offset
+                    length = m.length
                     # Build a short hex + ASCII preview
                     preview = ""
                     if file_data and offset < len(file_data):
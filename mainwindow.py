@@ -8,17 +8,21 @@ Usage:
 """
 
 # Standard library imports
+import base64
 import fnmatch
+import hashlib
+import html
+import json
 import os
 import re
 import sys
+import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Set
 
 # Third-party imports
 from PySide6.QtCore import QDir, QEvent, QModelIndex, QTimer, Qt
-from PySide6.QtGui import (QIcon, QPainter, QPen, QPixmap, QStandardItem,
-                           QTextCursor)
+from PySide6.QtGui import QTextCursor
 from PySide6.QtWidgets import (QAbstractItemView, QApplication, QComboBox,
                                QDockWidget, QFileDialog, QHBoxLayout,
                                QHeaderView, QLabel, QLineEdit, QListWidgetItem,
@@ -28,9 +32,10 @@ from PySide6.QtWidgets import (QAbstractItemView, QApplication, QComboBox,
 
 # Local imports
 from checkable_fs_model import CheckableFsModel
+from file_table_model import FileTableModel
 from scan_results import ScanResultsManager
-from scanner import YaraScanner, YARA_X_AVAILABLE, YARAAST_AVAILABLE, format_size
-from scanner_worker import ScanWorker
+from scanner import RuleMatch, YaraScanner, YARA_X_AVAILABLE, YARAAST_AVAILABLE
+from scanner_worker import FormatWorker, ScanWorker
 from themes import theme_manager
 from ui_form import Ui_MainWindow
 from yara_editor import YaraTextEdit
@@ -39,6 +44,69 @@ from hex_editor import HexEditorWindow
 from yara_rule_browser import YaraRuleBrowser
 
 
+# Paths resolved once at import rather than per call
+_APP_DIR = Path(__file__).parent
+_ICON_PATH = _APP_DIR / "assets" / "YaraXGUI.ico"
+_SETTINGS_PATH = _APP_DIR / "config" / "settings.json"
+_HOME_DIR = str(Path.home())
+
+# Qt's QWIDGETSIZE_MAX (not exported by PySide6): "no maximum size"
+_QWIDGETSIZE_MAX = 16777215
+
+# Rule text larger than this shows a "Formatting..." status while the
+# background formatter runs
+_FORMAT_STATUS_THRESHOLD = 50 * 1024
+
+# Rule files above this size ask for confirmation before being read
+_LARGE_RULE_FILE_BYTES = 5 * 1024 * 1024
+
+# Static markup/stylesheets, built once at import rather than per call
+_GETTING_STARTED_HTML = (
+    '<b>Steps to get started:</b><br>'
+    '1. Load or write YARA rules in the editor above<br>'
+    '2. Click <b>"Select Scan Dir"</b> to choose what to scan<br>'
+    '3. Click <b>"SCAN"</b> to start the scan<br>'
+)
+_READY_HTML = (
+    '<span style="color: gray;"><b>Ready to scan</b></span><br><br>'
+    + _GETTING_STARTED_HTML
+)
+_RESET_HTML = (
+    '<span style="color: gray;"><b>Complete reset performed</b></span><br><br>'
+    + _GETTING_STARTED_HTML
+)
+_ERROR_DIALOG_QSS = """
+    QMessageBox {
+        min-width: 300px;
+    }
+    QMessageBox QLabel {
+        min-width: 280px;
+    }
+"""
+
+# Compilation error parsing: "line N" locator and
+# (message substring, error type, icon, colour), checked in order
+_ERROR_LINE_RE = re.compile(r'line (\d+)', re.IGNORECASE)
+_ERROR_KINDS = (
+    ("syntax error", "Syntax Error", "📝", "#d32f2f"),         # Red
+    ("undefined", "Undefined Reference", "❓", "#f57c00"),     # Orange
+    ("duplicate", "Duplicate Definition", "🔄", "#f57c00"),    # Orange
+)
+# Compilation output error block; kept free of indentation whitespace,
+# which would otherwise end up in the output document
+_ERROR_HTML_TMPL = (
+    '<div style="border-left: 4px solid {color}; padding: 8px 12px; margin: 4px 0; background-color: {bg};">'
+    '<div style="color: {color}; font-weight: bold; margin-bottom: 4px;">'
+    '{icon} {error_type} <span style="color: {secondary}; font-size: 11px;">[{timestamp}]</span>{line_info}'
+    '</div>'
+    '<div style="color: {main}; font-family: \'Consolas\', \'Courier New\', monospace; font-size: 13px; line-height: 1.4;">'
+    '{message}'
+    '</div>'
+    '</div>'
+)
+_ERROR_LINE_INFO_TMPL = '<span style="color: {secondary}; font-size: 12px;"> (Line {line})</span>'
+
+
 class MainWindow(QMainWindow):
     """
     Main application window for YaraXGUI.
@@ -55,11 +123,21 @@ class MainWindow(QMainWindow):
     - Theme support (light/dark)
     - AST-based formatting and syntax validation (when yaraast is available)
     """
+
+    # Style fallback window icon, looked up once (see _use_fallback_icon)
+    _fallback_icon = None
     
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
+        self.theme_manager = theme_manager
+        # Compilation output colours per theme name (cleared in apply_theme)
+        self._output_colors_cache: Dict[str, Dict[str, str]] = {}
+        # Selection QSS per theme name (cleared in apply_theme), and each
+        # styled widget's own stylesheet without it (see update_themed_widgets)
+        self._selection_qss_cache: Dict[str, tuple] = {}
+        self._base_qss: Dict[str, str] = {}
         
         # Set custom window title and icon
         self.setWindowTitle("YaraXGUI - YARA Rule Scanner & Analyzer")
@@ -105,8 +183,13 @@ class MainWindow(QMainWindow):
             lambda msg: self.statusBar().showMessage(msg)
         )
 
-        # Invalidate compiled rules when editor text changes
-        self.ui.te_yara_editor.textChanged.connect(self.on_yara_text_changed)
+        # Invalidate compiled rules and track modification once typing
+        # pauses (debounced) rather than on every keystroke
+        self._edit_timer = QTimer(self)
+        self._edit_timer.setSingleShot(True)
+        self._edit_timer.setInterval(150)
+        self._edit_timer.timeout.connect(self._on_edit_settled)
+        self.ui.te_yara_editor.textChanged.connect(lambda: self._edit_timer.start())
 
         # Swap references when the active tab changes
         self._editor_tabs.current_editor_changed.connect(
@@ -115,7 +198,7 @@ class MainWindow(QMainWindow):
         # ── LSP client for yr-ls (YARA-X Language Server) ─────────
         from lsp_client import LspClient
         # When frozen with PyInstaller, files are in sys._MEIPASS
-        _base = Path(getattr(sys, '_MEIPASS', Path(__file__).parent))
+        _base = Path(getattr(sys, '_MEIPASS', _APP_DIR))
         yr_ls_path = _base / "bin" / "yr-ls.exe"
         self._lsp_client = None
         if yr_ls_path.exists():
@@ -196,7 +279,7 @@ class MainWindow(QMainWindow):
         self.fs_view.customContextMenuRequested.connect(self._show_fs_context_menu)
 
         # Setup
-        self.last_dir = str(Path.home())
+        self.last_dir = _HOME_DIR
         self.scan_root: Path | None = None
         self.compiled_rules = None  # Store compiled YARA rules
         
@@ -209,6 +292,10 @@ class MainWindow(QMainWindow):
 
         # Background scan worker (None when idle)
         self._scan_worker: ScanWorker | None = None
+        # Background "Format YARA" worker and the editor/text it started from
+        self._format_worker: FormatWorker | None = None
+        self._format_target = None
+        self._format_source = ""
 
         # Status-bar progress widgets (hidden until a scan starts)
         self._scan_progress = QProgressBar()
@@ -283,13 +370,7 @@ class MainWindow(QMainWindow):
         self.ui.listWidget.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
 
         # Set initial helpful message
-        self.ui.tb_compilation_output.setHtml(
-            '<span style="color: gray;"><b>Ready to scan</b></span><br><br>'
-            '<b>Steps to get started:</b><br>'
-            '1. Load or write YARA rules in the editor above<br>'
-            '2. Click <b>"Select Scan Dir"</b> to choose what to scan<br>'
-            '3. Click <b>"SCAN"</b> to start the scan<br>'
-        )
+        self.ui.tb_compilation_output.setHtml(_READY_HTML)
         
         # Setup context menu for compilation output
         self.setup_compilation_output_context_menu()
@@ -300,7 +381,6 @@ class MainWindow(QMainWindow):
         self._setup_dock_layout()
 
         # Initialize theming system
-        self.theme_manager = theme_manager
         self.setup_theming()
         self.load_theme_settings()
 
@@ -330,7 +410,7 @@ class MainWindow(QMainWindow):
         self._central_splitter = QSplitter(Qt.Orientation.Vertical)
         self._central_splitter.addWidget(self.ui.layoutWidget)
         # Remove the fixed max-height so the user can resize freely
-        self.ui.tb_compilation_output.setMaximumSize(16777215, 16777215)
+        self.ui.tb_compilation_output.setMaximumSize(_QWIDGETSIZE_MAX, _QWIDGETSIZE_MAX)
         self._central_splitter.addWidget(self.ui.tb_compilation_output)
         self._central_splitter.setStretchFactor(0, 80)
         self._central_splitter.setStretchFactor(1, 20)
@@ -444,7 +524,7 @@ class MainWindow(QMainWindow):
         from PySide6.QtWidgets import QDialog
         from settings_dialog import SettingsDialog
 
-        theme = self.theme_manager.current_theme if hasattr(self, 'theme_manager') else None
+        theme = self.theme_manager.current_theme
         app_font = QApplication.font()
 
         dlg = SettingsDialog(
@@ -480,17 +560,20 @@ class MainWindow(QMainWindow):
         self._save_setting('editor_tab_size', tab_size)
         self._apply_editor_font(family, size)
 
-    def _get_setting(self, key, default=None):
-        """Read a single value from config/settings.json."""
-        config_path = Path(__file__).parent / "config" / "settings.json"
+    def _read_settings(self) -> dict:
+        """Read config/settings.json (empty dict if missing or invalid)."""
+        config_path = _SETTINGS_PATH
         try:
             if config_path.exists():
-                import json
                 with open(config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f).get(key, default)
+                    return json.load(f)
         except Exception:
             pass
-        return default
+        return {}
+
+    def _get_setting(self, key, default=None):
+        """Read a single value from config/settings.json."""
+        return self._read_settings().get(key, default)
 
     def _apply_editor_font(self, family: str, size: int):
         """Apply font to every open editor tab (not compilation output)."""
@@ -523,8 +606,7 @@ class MainWindow(QMainWindow):
         # Reconnect to new editor
         editor.cursor_info_changed.connect(
             lambda msg: self.statusBar().showMessage(msg))
-        editor.textChanged.connect(self.on_yara_text_changed)
-        editor.textChanged.connect(self._on_editor_text_changed)
+        editor.textChanged.connect(lambda: self._edit_timer.start())
         editor.vim_mode_changed.connect(self._update_vim_mode_display)
         try:
             editor._vim_handler.save_requested.connect(self.on_save_rule)
@@ -536,8 +618,10 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'vim_checkbox'):
             editor.set_vim_mode(self.vim_checkbox.isChecked())
 
-        # Reset modification tracking for this tab
-        self._last_saved_text = editor.toPlainText()
+        # Reset modification tracking for this tab (a pending edit from the
+        # previous tab must not be attributed to this one)
+        self._edit_timer.stop()
+        editor.document().setModified(False)
         self._document_modified = False
         self.compiled_rules = None
 
@@ -590,11 +674,10 @@ class MainWindow(QMainWindow):
     def setup_application_icon(self):
         """Setup application icon from YaraXGUI.ico file"""
         from PySide6.QtGui import QIcon
-        from pathlib import Path
         
         try:
             # Use the specific YaraXGUI.ico file
-            icon_path = Path(__file__).parent / "assets" / "YaraXGUI.ico"
+            icon_path = _ICON_PATH
             
             if icon_path.exists():
                 # Load the icon file
@@ -619,7 +702,11 @@ class MainWindow(QMainWindow):
         """Use a fallback icon when the main icon fails to load"""
         try:
             # Try to use a system icon as fallback
-            icon = self.style().standardIcon(self.style().StandardPixmap.SP_FileDialogDetailedView)
+            icon = MainWindow._fallback_icon
+            if icon is None:
+                style = self.style()
+                icon = style.standardIcon(style.StandardPixmap.SP_FileDialogDetailedView)
+                MainWindow._fallback_icon = icon
             if not icon.isNull():
                 self.setWindowIcon(icon)
                 print("🔄 Using fallback system icon")
@@ -655,18 +742,30 @@ class MainWindow(QMainWindow):
 
         # Track document modification for save prompts
         self._document_modified = False
-        self._last_saved_text = self.ui.te_yara_editor.toPlainText()
-        self.ui.te_yara_editor.textChanged.connect(self._on_editor_text_changed)
+        self.ui.te_yara_editor.document().setModified(False)
+
+    def _on_edit_settled(self):
+        """Run the per-edit bookkeeping once typing pauses."""
+        self.on_yara_text_changed()
+        self._on_editor_text_changed()
+
+    def _flush_pending_edit(self):
+        """Apply a still-pending debounced edit right away."""
+        if self._edit_timer.isActive():
+            self._edit_timer.stop()
+            self._on_edit_settled()
 
     def _on_editor_text_changed(self):
         """Track when document is modified"""
-        current_text = self.ui.te_yara_editor.toPlainText()
-        self._document_modified = current_text != self._last_saved_text
+        # The document's modified flag follows the undo stack (cleared at
+        # load/save), so no per-keystroke copy of the whole text is needed.
+        # revision() can't be used: rehighlight() bumps it on theme changes.
+        self._document_modified = self.ui.te_yara_editor.document().isModified()
 
     def _has_unsaved_changes(self) -> bool:
         """Check if there are unsaved changes in the YARA editor"""
-        current_text = self.ui.te_yara_editor.toPlainText().strip()
-        if not current_text:
+        self._flush_pending_edit()
+        if self.ui.te_yara_editor.document().isEmpty():
             return False  # Empty document doesn't need saving
         return self._document_modified
     
@@ -699,8 +798,13 @@ class MainWindow(QMainWindow):
                 self._scan_worker.terminate()
                 self._scan_worker.wait(1000)
 
+        if self._format_worker is not None and self._format_worker.isRunning():
+            self._format_worker.cancel()
+            if not self._format_worker.wait(3000):
+                self._format_worker.terminate()
+                self._format_worker.wait(1000)
+
         # Persist dock layout so the user's arrangement is restored next time
-        import base64
         state_bytes = self.saveState().data()
         self._save_setting("dock_state", base64.b64encode(state_bytes).decode("ascii"))
         geometry_bytes = self.saveGeometry().data()
@@ -820,35 +924,66 @@ class MainWindow(QMainWindow):
 
     def configure_builtin_splitters(self):
         """Configure the built-in splitters from the UI form"""
-        # Configure the horizontal splitter (hits/misses vs rule details/similar files)
-        if hasattr(self.ui, 'splitter'):
-            # Set proportions (60% hits, 40% rule details)
-            self.ui.splitter.setStretchFactor(0, 60)  # Hits/Misses tab
-            self.ui.splitter.setStretchFactor(1, 40)  # Rule Details/Similar Files tab
-            
-            # Set minimum sizes to prevent panels from becoming too small
-            self.ui.splitter.setChildrenCollapsible(False)  # Prevent complete collapse
-            self.ui.tabWidget_2.setMinimumWidth(200)  # Min width for hits/misses
-            self.ui.tabWidget_3.setMinimumWidth(250)  # Min width for rule details
-        
-        # Configure the main vertical splitter (results vs bottom tabs)
-        if hasattr(self.ui, 'splitter_2'):
-            # Set proportions (70% for results, 30% for bottom tabs)
-            self.ui.splitter_2.setStretchFactor(0, 70)  # Results section (splitter)
-            self.ui.splitter_2.setStretchFactor(1, 30)  # Bottom tabs (tabWidget_4)
-            self.ui.splitter_2.setChildrenCollapsible(False)  # Prevent complete collapse
-        
-        # Configure the directory tree splitter
-        if hasattr(self.ui, 'splitter_3'):
-            # Set proportions (80% for tree, 20% for exclusion list)
-            self.ui.splitter_3.setStretchFactor(0, 80)  # Directory tree
-            self.ui.splitter_3.setStretchFactor(1, 20)  # Exclusion list
-            self.ui.splitter_3.setChildrenCollapsible(False)  # Prevent complete collapse
-            
-            # Remove the restrictive maximum height on listWidget to allow more splitter movement
-            self.ui.listWidget.setMaximumSize(16777215, 16777215)  # Remove height restriction
+        # (splitter, first pane %, second pane %); signals are blocked and
+        # repaints suspended so the setters don't each relayout the window
+        splitters = (
+            (getattr(self.ui, 'splitter', None), 60, 40),    # Hits/misses vs rule details/similar files
+            (getattr(self.ui, 'splitter_2', None), 70, 30),  # Results vs bottom tabs (tabWidget_4)
+            (getattr(self.ui, 'splitter_3', None), 80, 20),  # Directory tree vs exclusion list
+        )
+
+        self.setUpdatesEnabled(False)
+        try:
+            for splitter, first, second in splitters:
+                if splitter is None:
+                    continue
+                blocked = splitter.blockSignals(True)
+                splitter.setStretchFactor(0, first)
+                splitter.setStretchFactor(1, second)
+                splitter.setChildrenCollapsible(False)  # Prevent complete collapse
+                splitter.blockSignals(blocked)
+
+            if splitters[0][0] is not None:
+                # Set minimum sizes to prevent panels from becoming too small
+                self.ui.tabWidget_2.setMinimumWidth(200)  # Min width for hits/misses
+                self.ui.tabWidget_3.setMinimumWidth(250)  # Min width for rule details
+
+            if splitters[2][0] is not None:
+                # Remove the restrictive maximum height on listWidget to allow more splitter movement
+                self.ui.listWidget.setMaximumSize(_QWIDGETSIZE_MAX, _QWIDGETSIZE_MAX)
+        finally:
+            self.setUpdatesEnabled(True)
+        self.updateGeometry()
 
     # Utility Methods
+    def _append_output_lines(self, lines) -> None:
+        """Append plain-text paragraphs to the compilation output in one edit.
+
+        Equivalent to calling append() per line, but the document is laid
+        out (and scrolled) once for the whole batch.
+        """
+        output = self.ui.tb_compilation_output
+        vbar = output.verticalScrollBar()
+        at_bottom = vbar.value() >= vbar.maximum()
+
+        # New paragraphs take the view cursor's formats, as append() does
+        view_cursor = output.textCursor()
+        block_format, char_format = view_cursor.blockFormat(), view_cursor.charFormat()
+
+        cursor = QTextCursor(output.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for line in lines:
+            if output.document().isEmpty():
+                cursor.setCharFormat(char_format)
+            else:
+                cursor.insertBlock(block_format, char_format)
+            cursor.insertText(line)
+        cursor.endEditBlock()
+
+        if at_bottom:
+            vbar.setValue(vbar.maximum())
+
     def _handle_error(self, error: Exception, context: str = "Operation") -> None:
         """
         Centralized error handling with consistent logging and user feedback.
@@ -869,31 +1004,6 @@ class MainWindow(QMainWindow):
         status_msg = f"{context} failed: {error_msg[:80]}{'...' if len(error_msg) > 80 else ''}"
         self.statusBar().showMessage(status_msg, 5000)
 
-    def _safe_get_item_info(self, item):
-        """
-        Safely extract information from a tree widget item to avoid RuntimeError.
-        
-        Args:
-            item: QTreeWidgetItem to extract info from
-            
-        Returns:
-            dict: Dictionary with item information or None if item is invalid
-        """
-        if not item:
-            return None
-            
-        try:
-            return {
-                'text': item.text(0),
-                'parent': item.parent(),
-                'parent_text': item.parent().text(0) if item.parent() else None,
-                'child_count': item.childCount(),
-                'data': item.data(0, 32)  # Qt.UserRole
-            }
-        except RuntimeError:
-            # Item was deleted
-            return None
-
     def _format_compilation_error(self, error_msg: str, context: str) -> str:
         """
         Format compilation errors with nice HTML styling and better readability.
@@ -912,34 +1022,25 @@ class MainWindow(QMainWindow):
         theme_colors = self._get_theme_colors_for_output()
         
         # Parse common YARA error patterns for better formatting
-        if "syntax error" in error_msg.lower():
-            error_type = "Syntax Error"
-            icon = "📝"
-            color = "#d32f2f"  # Red
-        elif "undefined" in error_msg.lower():
-            error_type = "Undefined Reference"
-            icon = "❓"
-            color = "#f57c00"  # Orange
-        elif "duplicate" in error_msg.lower():
-            error_type = "Duplicate Definition"
-            icon = "🔄"
-            color = "#f57c00"  # Orange
-        elif "compilation" in context.lower():
-            error_type = "Compilation Error"
-            icon = "❌"
-            color = "#d32f2f"  # Red
+        lowered = error_msg.lower()
+        for needle, error_type, icon, color in _ERROR_KINDS:
+            if needle in lowered:
+                break
         else:
-            error_type = "Error"
-            icon = "⚠️"
+            if "compilation" in context.lower():
+                error_type = "Compilation Error"
+                icon = "❌"
+            else:
+                error_type = "Error"
+                icon = "⚠️"
             color = "#d32f2f"  # Red
         
         # Extract line number if present
         line_info = ""
-        import re
-        line_match = re.search(r'line (\d+)', error_msg, re.IGNORECASE)
+        line_match = _ERROR_LINE_RE.search(error_msg)
         if line_match:
-            line_num = line_match.group(1)
-            line_info = f'<span style="color: {theme_colors["secondary_text"]}; font-size: 12px;"> (Line {line_num})</span>'
+            line_info = _ERROR_LINE_INFO_TMPL.format(
+                secondary=theme_colors["secondary_text"], line=line_match.group(1))
         
         # Clean up the error message
         clean_error = error_msg.strip()
@@ -948,21 +1049,26 @@ class MainWindow(QMainWindow):
             clean_error = clean_error.split(':', 1)[1].strip()
         
         # Format the complete error with nice styling
-        formatted_error = f'''
-        <div style="border-left: 4px solid {color}; padding: 8px 12px; margin: 4px 0; background-color: {theme_colors["error_bg"]};">
-            <div style="color: {color}; font-weight: bold; margin-bottom: 4px;">
-                {icon} {error_type} <span style="color: {theme_colors["secondary_text"]}; font-size: 11px;">[{timestamp}]</span>{line_info}
-            </div>
-            <div style="color: {theme_colors["main_text"]}; font-family: 'Consolas', 'Courier New', monospace; font-size: 13px; line-height: 1.4;">
-                {self._escape_html(clean_error)}
-            </div>
-        </div>
-        '''
-        
-        return formatted_error
+        return _ERROR_HTML_TMPL.format(
+            color=color,
+            bg=theme_colors["error_bg"],
+            icon=icon,
+            error_type=error_type,
+            secondary=theme_colors["secondary_text"],
+            timestamp=timestamp,
+            line_info=line_info,
+            main=theme_colors["main_text"],
+            message=self._escape_html(clean_error),
+        )
 
     def _get_theme_colors_for_output(self):
         """Get theme-appropriate colors for compilation output formatting"""
+        theme = self.theme_manager.current_theme
+        key = theme.name if theme else ""
+        cached = self._output_colors_cache.get(key)
+        if cached is not None:
+            return cached
+
         # Default colors (for light theme)
         colors = {
             "main_text": "#333333",
@@ -970,9 +1076,8 @@ class MainWindow(QMainWindow):
             "error_bg": "rgba(211, 47, 47, 0.1)"
         }
         
-        # Check if we have a theme manager and current theme
-        if hasattr(self, 'theme_manager') and self.theme_manager.current_theme:
-            theme = self.theme_manager.current_theme
+        # Check if we have a current theme
+        if theme:
             if hasattr(theme, 'colors'):
                 # Use theme colors for better dark mode support
                 colors["main_text"] = theme.colors.editor_text
@@ -984,11 +1089,11 @@ class MainWindow(QMainWindow):
                 else:
                     colors["error_bg"] = "rgba(211, 47, 47, 0.1)"
         
+        self._output_colors_cache[key] = colors
         return colors
 
     def _escape_html(self, text: str) -> str:
         """Escape HTML characters in text for safe display"""
-        import html
         return html.escape(text)
     
     def _show_compilation_error_dialog(self, error_msg: str) -> None:
@@ -999,14 +1104,13 @@ class MainWindow(QMainWindow):
             error_msg: The compilation error message to display
         """
         from PySide6.QtWidgets import QMessageBox
-        import re
         
         msg = QMessageBox(self)
         msg.setIcon(QMessageBox.Icon.Critical)
         msg.setWindowTitle("⚠️ YARA Compilation Error")
         
         # Extract line number for better context
-        line_match = re.search(r'line (\d+)', error_msg, re.IGNORECASE)
+        line_match = _ERROR_LINE_RE.search(error_msg)
         if line_match:
             line_num = line_match.group(1)
             msg.setText(f"Compilation failed at line {line_num}")
@@ -1027,14 +1131,7 @@ class MainWindow(QMainWindow):
             msg.setInformativeText(clean_error)
         
         # Simple styling for better appearance
-        msg.setStyleSheet("""
-            QMessageBox {
-                min-width: 300px;
-            }
-            QMessageBox QLabel {
-                min-width: 280px;
-            }
-        """)
+        msg.setStyleSheet(_ERROR_DIALOG_QSS)
         
         msg.setStandardButtons(QMessageBox.StandardButton.Ok)
         msg.exec()
@@ -1065,7 +1162,6 @@ class MainWindow(QMainWindow):
             HTML-formatted code with proper monospace styling
         """
         # Escape HTML characters
-        import html
         escaped_code = html.escape(code)
         
         # Use proper monospace font family with fallbacks
@@ -1082,13 +1178,12 @@ class MainWindow(QMainWindow):
 
     def _setup_monospace_fonts(self) -> None:
         """Setup consistent monospace fonts across editor and compilation output."""
-        from PySide6.QtGui import QFont
-
-        # User overrides take priority over theme defaults
-        font_family = self._get_setting('editor_font_family', '')
-        font_size = self._get_setting('editor_font_size', 0)
+        # User overrides take priority over theme defaults (one settings read)
+        settings = self._read_settings()
+        font_family = settings.get('editor_font_family', '')
+        font_size = settings.get('editor_font_size', 0)
         if not font_family or not font_size:
-            theme = self.theme_manager.current_theme if hasattr(self, 'theme_manager') else None
+            theme = self.theme_manager.current_theme
             if theme:
                 font_family = font_family or theme.editor_font_family
                 font_size = font_size or theme.editor_font_size
@@ -1146,7 +1241,7 @@ class MainWindow(QMainWindow):
     
     def load_theme_settings(self):
         """Load saved theme settings or apply default theme"""
-        config_path = Path(__file__).parent / "config" / "settings.json"
+        config_path = _SETTINGS_PATH
 
         # Default to light theme
         current_theme = "Light"
@@ -1155,7 +1250,6 @@ class MainWindow(QMainWindow):
         # Try to load saved preferences
         try:
             if config_path.exists():
-                import json
                 with open(config_path, 'r', encoding='utf-8') as f:
                     settings = json.load(f)
                 current_theme = settings.get('theme', 'Light')
@@ -1181,9 +1275,8 @@ class MainWindow(QMainWindow):
         # Restore user font overrides (after theme is applied)
         try:
             if config_path.exists():
-                import json as _json
                 with open(config_path, 'r', encoding='utf-8') as f:
-                    _s = _json.load(f)
+                    _s = json.load(f)
                 _ff = _s.get('editor_font_family', '')
                 _fs = _s.get('editor_font_size', 0)
                 if _ff and _fs:
@@ -1198,7 +1291,6 @@ class MainWindow(QMainWindow):
         # Restore dock layout and window geometry from previous session
         try:
             if config_path.exists():
-                import json, base64
                 with open(config_path, 'r', encoding='utf-8') as f:
                     settings = json.load(f)
                 dock_state = settings.get('dock_state', '')
@@ -1236,9 +1328,8 @@ class MainWindow(QMainWindow):
 
     def _save_setting(self, key: str, value):
         """Persist a single key to config/settings.json."""
-        config_path = Path(__file__).parent / "config" / "settings.json"
+        config_path = _SETTINGS_PATH
         try:
-            import json
             settings = {}
             if config_path.exists():
                 with open(config_path, 'r', encoding='utf-8') as f:
@@ -1261,6 +1352,8 @@ class MainWindow(QMainWindow):
         """Apply the selected theme to the entire application."""
         theme = self.theme_manager.get_theme(theme_name)
         self.theme_manager.set_current_theme(theme_name)
+        self._output_colors_cache.clear()
+        self._selection_qss_cache.clear()
 
         stylesheet = self.theme_manager.generate_qss_stylesheet(theme)
         self.setStyleSheet(stylesheet)
@@ -1286,9 +1379,36 @@ class MainWindow(QMainWindow):
     
     def update_themed_widgets(self, theme):
         """Update widgets that need specific theme-aware styling"""
-        colors = theme.colors
+        hits_selection_style, tree_selection_style = self._selection_styles(theme)
         
         # Update persistent selection highlighting for hits table
+        if hasattr(self.ui, 'tv_file_hits'):
+            self._set_selection_style(self.ui.tv_file_hits, hits_selection_style)
+        
+        # Update similar files tree selection styling
+        if hasattr(self.ui, 'tw_similar_files'):
+            self._set_selection_style(self.ui.tw_similar_files, tree_selection_style)
+        
+        # Update match details table selection styling
+        if hasattr(self.ui, 'tw_match_details'):
+            self.ui.tw_match_details.setStyleSheet(tree_selection_style.replace('QTreeView', 'QTableWidget'))
+        
+        # Update compilation output styling for theme
+        self._update_compilation_output_theme(theme)
+        
+        # Update editor fonts with theme font settings
+        self._setup_monospace_fonts()
+        
+        # Force text editor selection colors using palette
+        self._update_text_editor_palette(theme)
+
+    def _selection_styles(self, theme):
+        """(table, tree) selection QSS for *theme*, built once per theme."""
+        cached = self._selection_qss_cache.get(theme.name)
+        if cached is not None:
+            return cached
+
+        colors = theme.colors
         hits_selection_style = f"""
             QTableView::item:selected {{
                 background-color: {colors.selection_background};
@@ -1299,54 +1419,31 @@ class MainWindow(QMainWindow):
                 color: {colors.selection_text};
             }}
         """
-        
-        if hasattr(self.ui, 'tv_file_hits'):
-            current_style = self.ui.tv_file_hits.styleSheet()
-            # Replace existing selection styles or add new ones
-            if "QTableView::item:selected" in current_style:
-                # Remove old selection styles and add new ones
-                import re
-                pattern = r'QTableView::item:selected[^}]*}[^}]*}'
-                current_style = re.sub(pattern, '', current_style)
-            
-            self.ui.tv_file_hits.setStyleSheet(current_style + hits_selection_style)
-        
-        # Update similar files tree selection styling
         tree_selection_style = f"""
-            QTreeWidget::item:selected {{
+            QTreeView::item:selected {{
                 background-color: {colors.selection_background};
                 color: {colors.selection_text};
             }}
-            QTreeWidget::item:selected:!active {{
+            QTreeView::item:selected:!active {{
                 background-color: {colors.selection_inactive};
                 color: {colors.selection_text};
             }}
         """
-        
-        if hasattr(self.ui, 'tw_similar_files'):
-            current_tree_style = self.ui.tw_similar_files.styleSheet()
-            if "QTreeWidget::item:selected" in current_tree_style:
-                import re
-                pattern = r'QTreeWidget::item:selected[^}]*}[^}]*}'
-                current_tree_style = re.sub(pattern, '', current_tree_style)
-            
-            self.ui.tw_similar_files.setStyleSheet(current_tree_style + tree_selection_style)
-        
-        # Update match details table selection styling
-        if hasattr(self.ui, 'tw_match_details'):
-            self.ui.tw_match_details.setStyleSheet(tree_selection_style.replace('QTreeWidget', 'QTableWidget'))
-        
-        # Update compilation output styling for theme
-        self._update_compilation_output_theme(theme)
-        
-        # Update checkbox icons with theme colors
-        self.update_checkbox_icons(theme)
-        
-        # Update editor fonts with theme font settings
-        self._setup_monospace_fonts()
-        
-        # Force text editor selection colors using palette
-        self._update_text_editor_palette(theme)
+        cached = self._selection_qss_cache[theme.name] = (hits_selection_style,
+                                                          tree_selection_style)
+        return cached
+
+    def _set_selection_style(self, widget, selection_style: str) -> None:
+        """Set *widget*'s own stylesheet plus *selection_style*.
+
+        The widget's stylesheet from before the first theme is remembered,
+        so the old selection rules are replaced without parsing them back
+        out, and an unchanged stylesheet is not re-applied.
+        """
+        base = self._base_qss.setdefault(widget.objectName(), widget.styleSheet())
+        style = base + selection_style
+        if widget.styleSheet() != style:
+            widget.setStyleSheet(style)
 
     def _update_compilation_output_theme(self, theme):
         """Update compilation output styling based on current theme"""
@@ -1397,71 +1494,6 @@ class MainWindow(QMainWindow):
                 # Trigger current line highlight refresh
                 editor.cursorPositionChanged.emit()
     
-    def create_checkbox_icon(self, size=16, checked=False, theme=None):
-        """Create a custom checkbox icon with proper checkmark"""
-        if theme is None:
-            theme = self.theme_manager.current_theme
-        
-        colors = theme.colors
-        
-        # Create pixmap
-        pixmap = QPixmap(size, size)
-        pixmap.fill(Qt.GlobalColor.transparent)
-        
-        # Create painter
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Draw checkbox border and background
-        if checked:
-            # Checked: white background with colored border
-            painter.fillRect(1, 1, size-2, size-2, Qt.GlobalColor.white)
-            pen = QPen(Qt.GlobalColor.red, 2)  # Red border for checked
-        else:
-            # Unchecked: light background with gray border  
-            painter.fillRect(1, 1, size-2, size-2, Qt.GlobalColor.white)
-            pen = QPen(Qt.GlobalColor.gray, 1)  # Gray border for unchecked
-        
-        painter.setPen(pen)
-        painter.drawRect(1, 1, size-3, size-3)
-        
-        if checked:
-            # Draw checkmark
-            pen = QPen(Qt.GlobalColor.red, 2)
-            pen.setCapStyle(Qt.PenCapStyle.RoundCap)
-            pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
-            painter.setPen(pen)
-            
-            # Draw checkmark path
-            # Start from left-middle, go to bottom-center, then to top-right
-            checkmark_points = [
-                (size * 0.25, size * 0.5),      # Left point
-                (size * 0.45, size * 0.7),      # Bottom point  
-                (size * 0.75, size * 0.3)       # Right point
-            ]
-            
-            # Draw the checkmark lines
-            painter.drawLine(int(checkmark_points[0][0]), int(checkmark_points[0][1]),
-                           int(checkmark_points[1][0]), int(checkmark_points[1][1]))
-            painter.drawLine(int(checkmark_points[1][0]), int(checkmark_points[1][1]),
-                           int(checkmark_points[2][0]), int(checkmark_points[2][1]))
-        
-        painter.end()
-        return QIcon(pixmap)
-
-    def update_checkbox_icons(self, theme):
-        """Update tree view checkbox icons with theme-appropriate colors"""
-        # Create custom checkbox icons
-        checked_icon = self.create_checkbox_icon(16, checked=True, theme=theme)
-        unchecked_icon = self.create_checkbox_icon(16, checked=False, theme=theme)
-        
-        # Apply to the file system tree view
-        if hasattr(self, 'fs_view'):
-            # Note: Qt doesn't have a direct way to set checkbox icons via stylesheet
-            # We would need to implement a custom delegate or use a different approach
-            # TODO: Implement custom delegate for checkbox styling
-            return
-
     def on_browse_yara(self):
         """Toggle the YARA rule browser panel.
 
@@ -1498,11 +1530,30 @@ class MainWindow(QMainWindow):
         if not path:
             return
         try:
-            text = Path(path).read_text(encoding="utf-8", errors="replace")
+            text = self._read_rule_file(path)
         except Exception as e:
             QMessageBox.critical(self, "Open failed", f"Could not read file:\n{e}")
             return
-        self._load_text_to_editor(text, source_path=path)
+        if text is not None:
+            self._load_text_to_editor(text, source_path=path)
+
+    def _read_rule_file(self, path) -> str | None:
+        """Read a rule file for the editor, or None if the user declines.
+
+        The size is checked with stat() first, so an oversized file is
+        confirmed before it is read and decoded rather than after.
+        """
+        path = Path(path)
+        size = path.stat().st_size
+        if size > _LARGE_RULE_FILE_BYTES:
+            reply = QMessageBox.question(
+                self, "Large file",
+                f"{path.name} is {size / (1024 * 1024):.1f} MB. Syntax highlighting "
+                "will be disabled and the editor may be slow.\n\nOpen it anyway?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                return None
+        return path.read_text(encoding="utf-8", errors="replace")
 
     def _on_yara_file_requested(self, filepath: str):
         """Handle double-click on a rule file — open in a tab."""
@@ -1512,11 +1563,12 @@ class MainWindow(QMainWindow):
             self._editor_tabs.setCurrentIndex(existing)
             return
         try:
-            text = Path(filepath).read_text(encoding="utf-8", errors="replace")
+            text = self._read_rule_file(filepath)
         except Exception as e:
             QMessageBox.critical(self, "Open failed", f"Could not read file:\n{e}")
             return
-        self._load_text_to_editor(text, source_path=filepath)
+        if text is not None:
+            self._load_text_to_editor(text, source_path=filepath)
 
     def _on_yara_files_requested(self, filepaths: list):
         """Handle multi-file request — open each in its own tab."""
@@ -1617,7 +1669,7 @@ class MainWindow(QMainWindow):
                 hl.set_ast_enabled(True)
 
             # Mark document as not modified (just loaded from file)
-            self._last_saved_text = text
+            editor.document().setModified(False)
             self._document_modified = False
 
             if source_path:
@@ -1653,10 +1705,10 @@ class MainWindow(QMainWindow):
         try:
             Path(path).write_text(text, encoding="utf-8")
             self.last_dir = str(Path(path).parent)
-            self._last_saved_text = text
+            editor = self.ui.te_yara_editor
+            editor.document().setModified(False)
             self._document_modified = False
             # Update the tab's source path and title
-            editor = self.ui.te_yara_editor
             editor._tab_source_path = path
             idx = self._editor_tabs.currentIndex()
             self._editor_tabs.setTabText(idx, Path(path).name)
@@ -1683,7 +1735,7 @@ class MainWindow(QMainWindow):
         self.compiled_rules = None
 
         # Reset document-modified tracking so close won't prompt
-        self._last_saved_text = ""
+        self.ui.te_yara_editor.document().setModified(False)
         self._document_modified = False
 
         # Clear all scan data
@@ -1699,17 +1751,11 @@ class MainWindow(QMainWindow):
 
         # Reset directory tree
         self.fs_view.setRootIndex(QModelIndex())
-        self.fs_model._unchecked.clear()
+        self.fs_model.clear_exclusions()
 
         # Clear and reset compilation output with helpful message
         self.ui.tb_compilation_output.clear()
-        self.ui.tb_compilation_output.setHtml(
-            '<span style="color: gray;"><b>Complete reset performed</b></span><br><br>'
-            '<b>Steps to get started:</b><br>'
-            '1. Load or write YARA rules in the editor above<br>'
-            '2. Click <b>"Select Scan Dir"</b> to choose what to scan<br>'
-            '3. Click <b>"SCAN"</b> to start the scan<br>'
-        )
+        self.ui.tb_compilation_output.setHtml(_RESET_HTML)
 
         # Reset AST highlighting settings
         if hasattr(self, 'highlighter') and self.highlighter:
@@ -1723,68 +1769,75 @@ class MainWindow(QMainWindow):
         self.statusBar().showMessage("Complete reset - ready for fresh start", 5000)
 
     def on_format_yara(self) -> None:
-        """Format the YARA rule in the editor using yara-x Formatter."""
-        text = self.ui.te_yara_editor.toPlainText()
+        """Format the YARA rule in the editor using yara-x Formatter.
+
+        Formatting runs on a FormatWorker thread; the result replaces the
+        editor text only if that editor still holds the text that was sent.
+        """
+        if self._format_worker is not None:
+            return  # already formatting; the button is disabled meanwhile
+
+        editor = self.ui.te_yara_editor
+        text = editor.toPlainText()
         
         if not text.strip():
             QMessageBox.information(self, "No Content", "No YARA rule to format.")
             return
         
-        # Try yara-x formatter first, fall back to yaraast if needed
-        if YARA_X_AVAILABLE:
-            try:
-                formatted_text = self.scanner.format_with_yara_x(text)
-                # Work around yara-x formatter bugs that add extra
-                # closing braces.  Strip trailing "}" one at a time
-                # until the count matches, then re-validate.
-                in_open = text.count('{')
-                in_close = text.count('}')
-                out_close = formatted_text.count('}')
-                if out_close > in_close and formatted_text.count('{') == in_open:
-                    fixed = formatted_text
-                    while fixed.count('}') > in_close:
-                        idx = fixed.rfind('}')
-                        if idx == -1:
-                            break
-                        fixed = fixed[:idx] + fixed[idx + 1:]
-                    fixed = fixed.strip()
-                    try:
-                        import yara_x as _yx
-                        _yx.compile(fixed)
-                        formatted_text = fixed
-                    except Exception:
-                        pass  # keep original formatter output if fix breaks it
-                # Replace text in-place (don't create a new tab)
-                self.ui.te_yara_editor.setPlainText(formatted_text)
-                self._last_saved_text = formatted_text
-                self._document_modified = False
-                self.statusBar().showMessage("YARA rule formatted with yara-x", 3000)
-                return
-            except Exception as e:
-                QMessageBox.warning(self, "Cannot Format Rule",
-                                   f"Unable to format YARA rule with yara-x:\n\n{str(e)}\n\n"
-                                   "Please fix the syntax errors first, then try formatting again.")
-                self.statusBar().showMessage(f"yara-x formatting failed: {str(e)[:50]}...", 5000)
-                return
-
-        # Fallback to yaraast if yara-x is not available
-        if YARAAST_AVAILABLE:
-            try:
-                formatted_text = self.scanner.format_with_ast(text)
-                self.ui.te_yara_editor.setPlainText(formatted_text)
-                self._last_saved_text = formatted_text
-                self._document_modified = False
-                self.statusBar().showMessage("YARA rule formatted with yaraast fallback", 3000)
-            except Exception as e:
-                QMessageBox.warning(self, "Cannot Format Rule",
-                                   f"Unable to format YARA rule due to syntax errors:\n\n{str(e)}\n\n"
-                                   "Please fix the syntax errors first, then try formatting again.")
-                self.statusBar().showMessage(f"Formatting failed: {str(e)[:50]}...", 5000)
-        else:
+        # yara-x formatter first, yaraast as the fallback
+        if not (YARA_X_AVAILABLE or YARAAST_AVAILABLE):
             QMessageBox.warning(self, "No Formatter Available",
                                "Neither yara-x nor yaraast is available for formatting. Please install one of them.")
             return
 
+        self._format_target = editor
+        self._format_source = text
+        self._format_worker = FormatWorker(self.scanner, text, self)
+        self._format_worker.result_ready.connect(self._on_format_finished)
+        self._format_worker.error.connect(self._on_format_error)
+        self._format_worker.finished.connect(self._on_format_thread_done)
+        self.ui.pb_format_yara.setEnabled(False)
+        if len(text) > _FORMAT_STATUS_THRESHOLD:
+            self.statusBar().showMessage("Formatting YARA rules...")
+        self._format_worker.start()
+
+    def _on_format_finished(self, formatted_text: str, engine: str) -> None:
+        """Apply formatter output (UI thread)."""
+        editor = self._format_target
+        if editor is not self.ui.te_yara_editor or editor.toPlainText() != self._format_source:
+            self.statusBar().showMessage("Rules changed while formatting - format discarded", 4000)
+            return
+        # Replace text in-place (don't create a new tab)
+        editor.setPlainText(formatted_text)
+        editor.document().setModified(False)
+        self._document_modified = False
+        if engine == 'yara-x':
+            self.statusBar().showMessage("YARA rule formatted with yara-x", 3000)
+        else:
+            self.statusBar().showMessage("YARA rule formatted with yaraast fallback", 3000)
+
+    def _on_format_error(self, engine: str, msg: str) -> None:
+        """Report a formatter failure (UI thread)."""
+        if engine == 'yara-x':
+            QMessageBox.warning(self, "Cannot Format Rule",
+                               f"Unable to format YARA rule with yara-x:\n\n{msg}\n\n"
+                               "Please fix the syntax errors first, then try formatting again.")
+            self.statusBar().showMessage(f"yara-x formatting failed: {msg[:50]}...", 5000)
+        else:
+            QMessageBox.warning(self, "Cannot Format Rule",
+                               f"Unable to format YARA rule due to syntax errors:\n\n{msg}\n\n"
+                               "Please fix the syntax errors first, then try formatting again.")
+            self.statusBar().showMessage(f"Formatting failed: {msg[:50]}...", 5000)
+
+    def _on_format_thread_done(self) -> None:
+        """Re-enable the Format button and drop the worker reference."""
+        self.ui.pb_format_yara.setEnabled(True)
+        self._format_target = None
+        self._format_source = ""
+        if self._format_worker is not None:
+            self._format_worker.deleteLater()
+            self._format_worker = None
+
     def on_scan(self) -> None:
         """Scan selected files with compiled YARA rules (runs on a worker thread).
 
@@ -1858,6 +1911,10 @@ class MainWindow(QMainWindow):
             QApplication.processEvents()
             
             rules = self.scanner.compile_rules(rule_text)
+            if self.scanner.last_compile_cached:
+                status_text = "YARA rules loaded from compile cache and ready for scanning"
+            else:
+                status_text = "YARA rules compiled and ready for scanning"
             
             # Format success message nicely with theme-aware colors
             theme_colors = self._get_theme_colors_for_output()
@@ -1869,7 +1926,7 @@ class MainWindow(QMainWindow):
                     ✅ Compilation Successful <span style="color: {theme_colors["secondary_text"]}; font-size: 11px;">[{timestamp}]</span>
                 </div>
                 <div style="color: {theme_colors["main_text"]}; font-size: 13px;">
-                    YARA rules compiled and ready for scanning
+                    {status_text}
                 </div>
             </div>
             '''
@@ -1960,19 +2017,24 @@ class MainWindow(QMainWindow):
 
     def _on_scan_finished(self, result: dict) -> None:
         """Worker finished (successfully or cancelled). Populate results into UI."""
-        # Process hits
-        for hit in result['hits']:
-            self.scan_hits.append(hit)
-            self._add_hit_to_table(hit['filename'], hit['filepath'],
-                                  hit['matched_rules'], hit.get('file_size', 0))
+        # Process hits (one bulk insert into the table model, sorted once)
+        self.scan_hits.extend(result['hits'])
+        # The worker indexed the hits by rule/tag as they came in; valid
+        # as long as this scan's hits are the whole list
+        if len(self.scan_hits) == len(result['hits']):
+            self.results.adopt_hit_index(self.scan_hits, result['hit_index'])
+        with self.results.deferred_sort(self.ui.tv_file_hits):
+            self.results.hits_model.append_rows(
+                self._hit_table_row(hit['filename'], hit['filepath'],
+                                    hit['matched_rules'], hit.get('file_size', 0))
+                for hit in result['hits']
+            )
 
         # Stash misses (displayed lazily via the tab-change hook)
-        for miss in result['misses']:
-            self.scan_misses.append(miss)
+        self.scan_misses.extend(result['misses'])
 
         # Surface per-file errors
-        for msg in result['error_messages']:
-            self.ui.tb_compilation_output.append(f"\n{msg}")
+        self._append_output_lines(f"\n{msg}" for msg in result['error_messages'])
 
         cancelled = bool(result.get('cancelled'))
         stats = result['stats']
@@ -2023,10 +2085,11 @@ class MainWindow(QMainWindow):
         self.statusBar().showMessage(
             "Cancelling scan \u2014 finishing current file...", 0)
     
-    def _add_hit_to_table(self, filename: str, filepath: str,
-                          matched_rules: List[Dict],
-                          file_size: int = 0) -> None:
-        """Add a hit to the hits table with appropriate styling."""
+    @staticmethod
+    def _hit_table_row(filename: str, filepath: str,
+                       matched_rules: List[RuleMatch],
+                       file_size: int = 0) -> tuple:
+        """Build a hits-table row with appropriate styling."""
         rules_count = len(matched_rules)
 
         # Choose display based on severity
@@ -2037,22 +2100,9 @@ class MainWindow(QMainWindow):
         else:
             filename_display = f"\U0001f6a8 {filename} ({rules_count})"
 
-        filename_item = QStandardItem(filename_display)
-        filename_item.setToolTip(
-            f"File: {filename}\nPath: {filepath}\n"
-            f"Rules matched: {', '.join([r['identifier'] for r in matched_rules])}"
-        )
-        # Store filepath in UserRole so consumers can retrieve it without a Path column
-        filename_item.setData(filepath, Qt.ItemDataRole.UserRole)
-
-        size_item = QStandardItem(format_size(file_size))
-        size_item.setData(file_size, Qt.ItemDataRole.UserRole)  # for sorting
-        size_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-
-        ext = Path(filename).suffix.lower() if '.' in filename else ''
-        ext_item = QStandardItem(ext)
-
-        self.results.hits_model.appendRow([filename_item, size_item, ext_item])
+        # The "Rules matched" tooltip line is formatted by the model on hover
+        return FileTableModel.make_row(
+            filename_display, filename, filepath, file_size, matched_rules)
     
     def _finalize_scan_results(self, stats: Dict[str, int]) -> None:
         """Finalize scan results and update UI."""
@@ -2075,24 +2125,31 @@ class MainWindow(QMainWindow):
 
     def _display_scan_summary(self, stats: Dict[str, int]) -> None:
         """Display scan completion summary."""
-        self.ui.tb_compilation_output.append("\n=== Scan Complete ===")
-        self.ui.tb_compilation_output.append(f"Files scanned: {stats['scanned']}")
-        self.ui.tb_compilation_output.append(f"Matches found: {stats['matches']}")
-        self.ui.tb_compilation_output.append(f"Files without matches: {len(self.scan_misses)}")
+        # Collected first so the output panel is laid out once
+        lines = [
+            "\n=== Scan Complete ===",
+            f"Files scanned: {stats['scanned']}",
+            f"Matches found: {stats['matches']}",
+            f"Files without matches: {len(self.scan_misses)}",
+        ]
 
         skipped = stats.get('skipped', 0)
         if skipped > 0:
-            self.ui.tb_compilation_output.append(
+            lines.append(
                 f"\u26A1 Skipped via filesize pre-filter: {skipped} "
                 f"(outside rule bounds \u2014 not read from disk)"
             )
 
         if stats['errors'] > 0:
-            self.ui.tb_compilation_output.append(f"Errors: {stats['errors']}")
+            lines.append(f"Errors: {stats['errors']}")
+
+        if stats['matches'] > 0:
+            lines.append("\n✓ Results populated in Scan Results tab")
+        else:
+            lines.append("\n✓ No threats detected - all files clean")
+        self._append_output_lines(lines)
 
         if stats['matches'] > 0:
-            self.ui.tb_compilation_output.append(f"\n✓ Results populated in Scan Results tab")
-            
             # Populate all views immediately after scan completion
             if self.scan_hits:
                 all_filepaths = {h['filepath'] for h in self.scan_hits}
@@ -2100,8 +2157,6 @@ class MainWindow(QMainWindow):
                 self.results.populate_similar_files(self.scan_hits, all_filepaths)
                 self.results.populate_similar_tags(self.scan_hits, all_filepaths)
                 self.results.populate_match_details(self.scan_hits)
-        else:
-            self.ui.tb_compilation_output.append(f"\n✓ No threats detected - all files clean")
 
         self.statusBar().showMessage(
             f"Scan complete: {stats['scanned']} files, {stats['matches']} matches",
@@ -2248,27 +2303,27 @@ class MainWindow(QMainWindow):
         return True
 
     def _fs_refresh_view(self) -> None:
-        """Refresh the tree and exclusion list after bulk changes to
-        ``_unchecked`` (direct mutation bypasses :meth:`setData`)."""
+        """Refresh the tree and exclusion list after bulk exclusion changes
+        (``add_exclusion``/``clear_exclusions`` bypass :meth:`setData`, and
+        their ``batch_exclusions`` block has already announced the change)."""
         root_idx = self.fs_view.rootIndex()
         if root_idx.isValid():
             self.fs_model._update_visible_children(root_idx)
         self.update_exclusion_list()
-        self.fs_model.exclusionsChanged.emit()
 
     def _on_fs_select_all(self) -> None:
         if not self._fs_require_scan_root():
             return
-        self.fs_model._unchecked.clear()
+        self.fs_model.clear_exclusions()
         self._fs_refresh_view()
         self.statusBar().showMessage("All files selected", 3000)
 
     def _on_fs_deselect_all(self) -> None:
         if not self._fs_require_scan_root():
             return
-        root = self.fs_model._normalize_path(str(self.scan_root))
-        self.fs_model._unchecked.clear()
-        self.fs_model._unchecked.add(root)
+        with self.fs_model.batch_exclusions():
+            self.fs_model.clear_exclusions()
+            self.fs_model.add_exclusion(str(self.scan_root))
         self._fs_refresh_view()
         self.statusBar().showMessage("All files deselected", 3000)
 
@@ -2285,16 +2340,14 @@ class MainWindow(QMainWindow):
         QApplication.setOverrideCursor(Qt.WaitCursor)
         try:
             added = 0
-            normalize = self.fs_model._normalize_path
-            unchecked = self.fs_model._unchecked
-            for root, dirs, files in os.walk(self.scan_root):
-                for name in files:
-                    full = os.path.join(root, name)
-                    if match(name, full):
-                        norm = normalize(full)
-                        if norm not in unchecked:
-                            unchecked.add(norm)
-                            added += 1
+            add_exclusion = self.fs_model.add_exclusion
+            with self.fs_model.batch_exclusions():
+                for root, dirs, files in os.walk(self.scan_root):
+                    for name in files:
+                        full = os.path.join(root, name)
+                        if match(name, full):
+                            if add_exclusion(full):
+                                added += 1
         finally:
             QApplication.restoreOverrideCursor()
 
@@ -2310,11 +2363,11 @@ class MainWindow(QMainWindow):
 
         1. Bottom-up: count matching files per directory subtree.
         2. Top-down: directories whose subtree has zero matches are
-           excluded wholesale (a single entry in ``_unchecked``).
+           excluded wholesale (a single exclusion entry).
            Directories with matches are descended into, and each file
            there is individually excluded if it doesn't match.
 
-        This keeps ``_unchecked`` small even for very large trees.
+        This keeps the exclusion list small even for very large trees.
         """
         if not self._fs_require_scan_root():
             return
@@ -2355,27 +2408,32 @@ class MainWindow(QMainWindow):
 
             # Pass 2: start fresh, then exclude empty branches wholesale
             # and individual non-matching files in live branches.
-            unchecked = set()
-            normalize = self.fs_model._normalize_path
+            unchecked: List[str] = []
             total_matches = match_count.get(str(self.scan_root), 0)
 
-            skipped_dirs: List[str] = []  # prefixes we've already excluded
+            # Dirs inside an excluded branch. dir_order lists parents before
+            # children, so one parent lookup replaces a prefix scan over
+            # every excluded branch.
+            skipped_dirs: Set[str] = set()
             for d in dir_order:
                 # If an ancestor was already excluded, skip quickly.
-                if any(d == s or d.startswith(s + os.sep)
-                       for s in skipped_dirs):
+                if os.path.dirname(d) in skipped_dirs:
+                    skipped_dirs.add(d)
                     continue
                 if match_count.get(d, 0) == 0:
                     # Entire subtree has no matches - exclude the dir
-                    unchecked.add(normalize(d))
-                    skipped_dirs.append(d)
+                    unchecked.append(d)
+                    skipped_dirs.add(d)
                     continue
                 # Live branch: exclude non-matching files individually.
                 for name, full, is_match in dir_files[d]:
                     if not is_match:
-                        unchecked.add(normalize(full))
+                        unchecked.append(full)
 
-            self.fs_model._unchecked = unchecked
+            with self.fs_model.batch_exclusions():
+                self.fs_model.clear_exclusions()
+                for path in unchecked:
+                    self.fs_model.add_exclusion(path)
         finally:
             QApplication.restoreOverrideCursor()
 
@@ -2463,8 +2521,9 @@ class MainWindow(QMainWindow):
             ext = fp.suffix.lower()
             if ext in (".yar", ".yara", ".yarax"):
                 try:
-                    text = fp.read_text(encoding="utf-8")
-                    self._load_text_to_editor(text, source_path=str(fp))
+                    text = self._read_rule_file(fp)
+                    if text is not None:
+                        self._load_text_to_editor(text, source_path=str(fp))
                 except Exception as e:
                     self.statusBar().showMessage(
                         f"Failed to load {fp.name}: {e}", 5000)
@@ -2543,12 +2602,7 @@ class MainWindow(QMainWindow):
 
     def on_tree_expanded(self, index: QModelIndex):
         """When user expands a node, update the checkboxes of its immediate children"""
-        row_count = self.fs_model.rowCount(index)
-        for row in range(row_count):
-            child_index = self.fs_model.index(row, 0, index)
-            if child_index.isValid():
-                # Trigger checkbox update
-                self.fs_model.dataChanged.emit(child_index, child_index, [Qt.CheckStateRole])
+        self.fs_model._update_visible_children(index)
 
     def update_exclusion_list(self):
         """Update list widget to show EXCLUDED items"""
@@ -2609,32 +2663,7 @@ class MainWindow(QMainWindow):
         """
         if self.scan_root is None:
             return
-
-        # Manual directory walk to avoid traversing into excluded directories
-        for root, dirs, files in os.walk(self.scan_root):
-            root_path = Path(root)
-
-            # Check if current directory is excluded
-            if self.fs_model.is_excluded(root_path):
-                # Skip this entire directory tree
-                dirs.clear()  # Don't descend into subdirectories
-                continue
-
-            # Filter out excluded subdirectories from dirs (modifies in-place)
-            dirs_to_remove = []
-            for dir_name in dirs:
-                dir_path = root_path / dir_name
-                if self.fs_model.is_excluded(dir_path):
-                    dirs_to_remove.append(dir_name)
-
-            for dir_name in dirs_to_remove:
-                dirs.remove(dir_name)
-
-            # Yield non-excluded files
-            for file_name in files:
-                file_path = root_path / file_name
-                if not self.fs_model.is_excluded(file_path):
-                    yield file_path
+        yield from self.fs_model.iter_included_files(str(self.scan_root))
 
     def on_results_tab_changed(self, index):
         """Handle tab changes in scan results - lazy load misses when needed."""
@@ -2665,11 +2694,7 @@ class MainWindow(QMainWindow):
         selected_hits = []
         for index in selected_indexes:
             source_index = self.results.hits_proxy.mapToSource(index)
-            row = source_index.row()
-            filename_item = self.results.hits_model.item(row, 0)
-            if not filename_item:
-                continue
-            filepath = filename_item.data(Qt.ItemDataRole.UserRole)
+            filepath = self.results.hits_model.filepath(source_index.row())
             if not filepath:
                 continue
             for hit in self.scan_hits:
@@ -2812,7 +2837,6 @@ class MainWindow(QMainWindow):
 
     def _copy_file_hash(self, filepath: str, algo: str):
         """Compute and copy a file hash to clipboard."""
-        import hashlib
         try:
             h = hashlib.new(algo)
             with open(filepath, 'rb') as f:
@@ -2827,8 +2851,6 @@ class MainWindow(QMainWindow):
 
     def _show_file_info_dialog(self, filepath: str):
         """Show a dialog with file hashes and metadata."""
-        import hashlib
-        import time as _time
 
         p = Path(filepath)
         if not p.exists():
@@ -2838,10 +2860,10 @@ class MainWindow(QMainWindow):
         try:
             stat = p.stat()
             size = stat.st_size
-            mtime = _time.strftime("%Y-%m-%d %H:%M:%S",
-                                   _time.localtime(stat.st_mtime))
-            ctime = _time.strftime("%Y-%m-%d %H:%M:%S",
-                                   _time.localtime(stat.st_ctime))
+            mtime = time.strftime("%Y-%m-%d %H:%M:%S",
+                                  time.localtime(stat.st_mtime))
+            ctime = time.strftime("%Y-%m-%d %H:%M:%S",
+                                  time.localtime(stat.st_ctime))
 
             data = p.read_bytes()
             md5 = hashlib.md5(data).hexdigest()
@@ -2956,11 +2978,7 @@ class MainWindow(QMainWindow):
             return
 
         source_index = self.results.hits_proxy.mapToSource(index)
-        row = source_index.row()
-        filename_item = self.results.hits_model.item(row, 0)
-        if not filename_item:
-            return
-        filepath = filename_item.data(Qt.ItemDataRole.UserRole)
+        filepath = self.results.hits_model.filepath(source_index.row())
         if not filepath:
             return
 
@@ -0,0 +1,138 @@
+# This Python file uses the following encoding: utf-8
+
+"""
+MatchDetailsModel - table model for the per-pattern YARA match list.
+
+Replaces the QTableWidget that held one QTableWidgetItem per cell. Each
+column lives in its own list, and the view only asks data() for the cells
+it paints, so a selection with thousands of matches costs a handful of
+lists instead of thousands of item objects.
+
+The Data Preview and Hex Dump cells may be given as a memoryview of the
+matched bytes; they are turned into text the first time they are asked
+for, so matches that are never shown never copy or format their data.
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QBrush, QColor
+
+# Data Preview / Hex Dump cell: display text, or the raw matched bytes
+MatchBytes = Union[str, memoryview]
+# (file, rule, pattern id, offset, length, data preview, hex dump, tags)
+MatchRow = Tuple[str, str, str, int, int, MatchBytes, MatchBytes, str]
+
+HEADERS = ('File', 'Rule', 'Pattern ID', 'Offset', 'Data Preview', 'Hex Dump', 'Tag')
+COL_FILE, COL_RULE, COL_PATTERN, COL_OFFSET, COL_DATA, COL_HEX, COL_TAG = range(len(HEADERS))
+
+_DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+_BACKGROUND_ROLE = Qt.ItemDataRole.BackgroundRole
+_USER_ROLE = Qt.ItemDataRole.UserRole
+
+# Byte -> preview character: printable ASCII as-is, everything else '.'
+_PREVIEW_TABLE = bytes(b if 32 <= b <= 126 else ord('.') for b in range(256))
+
+
+class MatchDetailsModel(QAbstractTableModel):
+    """Read-only match table backed by parallel per-column lists.
+
+    Only DisplayRole, BackgroundRole (per-column theme colour) and
+    UserRole on the Offset column (match length) are answered; every
+    other role returns None straight away.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._files: List[str] = []
+        self._rules: List[str] = []
+        self._patterns: List[str] = []
+        self._offsets: List[int] = []
+        self._lengths: List[int] = []
+        self._previews: List[MatchBytes] = []
+        self._hexdumps: List[MatchBytes] = []
+        self._tags: List[str] = []
+        # "0x%08x" offset text, formatted on first request then reused by
+        # repaints, sorting and filtering
+        self._offset_texts: List[Optional[str]] = []
+        self._columns = (self._files, self._rules, self._patterns, None,
+                         self._previews, self._hexdumps, self._tags)
+        # Stored as brushes, the type the delegate paints backgrounds with
+        self._backgrounds: List[Optional[QBrush]] = [None] * len(HEADERS)
+
+    # ─── Qt model interface ──────────────────────────────────────────────
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._files)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def data(self, index: QModelIndex, role: int = _DISPLAY_ROLE):
+        if role == _DISPLAY_ROLE:
+            col = index.column()
+            if col == COL_OFFSET:
+                row = index.row()
+                text = self._offset_texts[row]
+                if text is None:
+                    text = self._offset_texts[row] = f"0x{self._offsets[row]:08x}"
+                return text
+            column = self._columns[col]
+            row = index.row()
+            value = column[row]
+            if value.__class__ is memoryview:
+                # Formatted once, then reused by repaints, sorting and filtering
+                if col == COL_HEX:
+                    value = value.hex(' ').upper()
+                else:
+                    value = value.tobytes().translate(_PREVIEW_TABLE).decode('ascii')
+                column[row] = value
+            return value
+        if role == _BACKGROUND_ROLE:
+            return self._backgrounds[index.column()]
+        if role == _USER_ROLE and index.column() == COL_OFFSET:
+            return self._lengths[index.row()]
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = _DISPLAY_ROLE):
+        if (role == _DISPLAY_ROLE
+                and orientation == Qt.Orientation.Horizontal
+                and 0 <= section < len(HEADERS)):
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    # ─── Population ──────────────────────────────────────────────────────
+
+    def set_rows(self, rows: Iterable[MatchRow],
+                 column_colors: Sequence[Optional[QColor]] = ()) -> None:
+        """Replace the table contents (and per-column backgrounds)."""
+        self.beginResetModel()
+        for column in (self._files, self._rules, self._patterns, self._offsets,
+                       self._lengths, self._previews, self._hexdumps, self._tags):
+            column.clear()
+        for file, rule, pattern, offset, length, preview, hexdump, tags in rows:
+            self._files.append(file)
+            self._rules.append(rule)
+            self._patterns.append(pattern)
+            self._offsets.append(offset)
+            self._lengths.append(length)
+            self._previews.append(preview)
+            self._hexdumps.append(hexdump)
+            self._tags.append(tags)
+        self._offset_texts = [None] * len(self._offsets)
+        brushes = [QBrush(c) if c is not None else None
+                   for c in list(column_colors)[:len(HEADERS)]]
+        self._backgrounds = brushes + [None] * (len(HEADERS) - len(brushes))
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.set_rows(())
+
+    # ─── Row accessors ───────────────────────────────────────────────────
+
+    def offset(self, row: int) -> int:
+        return self._offsets[row]
+
+    def length(self, row: int) -> int:
+        return self._lengths[row]
@@ -7,18 +7,29 @@ Handles hits/misses tables, rule details, similar files/tags, and match details.
 Deduplicates near-identical single/multi-selection methods into unified APIs.
 """
 
-from pathlib import Path
-from typing import Dict, List, Optional, Set
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set, Tuple
 
-from PySide6.QtCore import QObject, Qt, Signal
-from scanner import format_size
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
 from PySide6.QtGui import QColor, QStandardItem, QStandardItemModel
-from PySide6.QtWidgets import (QAbstractItemView, QHeaderView, QMenu,
-                               QTableWidgetItem, QTreeWidgetItem)
+from PySide6.QtWidgets import QAbstractItemView, QHeaderView, QMenu
 
+from file_table_model import FileTableModel
+from match_details_model import (COL_DATA, COL_FILE, COL_HEX, COL_OFFSET,
+                                 COL_PATTERN, COL_RULE, MatchDetailsModel)
+from scanner import HitIndex, RuleMatch
 from search_filter import (DebouncedSearchBar, MultiColumnFilterProxy,
-                           filter_table_widget, filter_tree_widget,
-                           inject_search_bar)
+                           TreeFilterProxy, inject_search_bar)
+from similar_tree_model import SimilarTreeModel
+
+# Initial widths of the match details columns (File .. Tag)
+_MATCH_DETAILS_WIDTHS = (200, 150, 100, 100, 250, 200, 100)
+
+
+def _rules_matched_detail(matched_rules: List[RuleMatch]) -> str:
+    """Hits-table tooltip line, built only when the tooltip is shown."""
+    return f"Rules matched: {', '.join(r.identifier for r in matched_rules)}"
 
 
 class ScanResultsManager(QObject):
@@ -40,17 +51,26 @@ class ScanResultsManager(QObject):
         super().__init__(parent)
         self.ui = ui
         self.theme_manager = theme_manager
+        # Optional in older form layouts; looked up once here
+        self.tw_similar_tags = getattr(ui, 'tw_similar_tags', None)
+        # (theme, QColors) from the last _match_column_colors() call
+        self._column_colors_cache: Optional[Tuple[object, List[QColor]]] = None
+        # ((id, len) of the indexed scan_hits list, its index); see _hit_index()
+        self._hit_index_cache: Optional[Tuple[Tuple[int, int], HitIndex]] = None
 
         # Models owned by this manager
-        self.hits_model = QStandardItemModel()
-        self.hits_model.setHorizontalHeaderLabels(['File', 'Size', 'Ext'])
-
-        self.misses_model = QStandardItemModel()
-        self.misses_model.setHorizontalHeaderLabels(['File', 'Size', 'Ext'])
+        self.hits_model = FileTableModel(parent=self,
+                                         detail_formatter=_rules_matched_detail)
+        self.misses_model = FileTableModel(parent=self)
 
         self.rule_details_model = QStandardItemModel()
         self.rule_details_model.setHorizontalHeaderLabels(['Property', 'Value'])
 
+        self.match_details_model = MatchDetailsModel(parent=self)
+
+        self.similar_files_model = SimilarTreeModel(('File/Rule', 'Info'), parent=self)
+        self.similar_tags_model = SimilarTreeModel(('Tag/File', 'Details'), parent=self)
+
         # Proxy models for filtered views
         self.hits_proxy = MultiColumnFilterProxy(parent=self)
         self.hits_proxy.setSourceModel(self.hits_model)
@@ -58,78 +78,102 @@ class ScanResultsManager(QObject):
         self.misses_proxy.setSourceModel(self.misses_model)
         self.rule_details_proxy = MultiColumnFilterProxy(parent=self)
         self.rule_details_proxy.setSourceModel(self.rule_details_model)
+        self.match_details_proxy = MultiColumnFilterProxy(parent=self)
+        self.match_details_proxy.setSourceModel(self.match_details_model)
+        self.similar_files_proxy = TreeFilterProxy(parent=self)
+        self.similar_files_proxy.setSourceModel(self.similar_files_model)
+        self.similar_tags_proxy = TreeFilterProxy(parent=self)
+        self.similar_tags_proxy.setSourceModel(self.similar_tags_model)
 
         # Search bars (populated in setup_scan_results_ui)
         self._search_bars = {}
 
         self.misses_loaded = False
 
+        # Latest double-click navigation (identifier, tag), run on the
+        # next event loop pass so a burst of clicks only navigates once
+        self._pending_nav: Optional[Tuple[str, Optional[str]]] = None
+
     def setup_scan_results_ui(self):
         """Setup models and connections for scan results."""
+        # Each widget is configured with updates suspended, and sorting is
+        # switched on last so header/column setup doesn't trigger sorts
+
         # --- Hits table ---
-        self.ui.tv_file_hits.setModel(self.hits_proxy)
-        self.ui.tv_file_hits.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
-        self.ui.tv_file_hits.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.ui.tv_file_hits.setSortingEnabled(True)
-        self._make_table_compact(self.ui.tv_file_hits)
-
-        hits_header = self.ui.tv_file_hits.horizontalHeader()
-        hits_header.setStretchLastSection(False)
-        hits_header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        hits_header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        hits_header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        hits_header.setMinimumSectionSize(40)
-        self.ui.tv_file_hits.setWordWrap(False)
-        self.ui.tv_file_hits.setTextElideMode(Qt.TextElideMode.ElideMiddle)
+        with self._updates_suspended(self.ui.tv_file_hits):
+            self.ui.tv_file_hits.setModel(self.hits_proxy)
+            self.ui.tv_file_hits.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+            self.ui.tv_file_hits.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+            self._make_table_compact(self.ui.tv_file_hits)
+
+            hits_header = self.ui.tv_file_hits.horizontalHeader()
+            hits_header.setStretchLastSection(False)
+            hits_header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+            hits_header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+            hits_header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+            hits_header.setMinimumSectionSize(40)
+            self.ui.tv_file_hits.setWordWrap(False)
+            self.ui.tv_file_hits.setTextElideMode(Qt.TextElideMode.ElideMiddle)
+            self.ui.tv_file_hits.setSortingEnabled(True)
 
         # --- Misses table ---
-        self.ui.tv_file_misses.setModel(self.misses_proxy)
-        self._make_table_compact(self.ui.tv_file_misses)
-        self.ui.tv_file_misses.setSortingEnabled(True)
-
-        misses_header = self.ui.tv_file_misses.horizontalHeader()
-        misses_header.setStretchLastSection(False)
-        misses_header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        misses_header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        misses_header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        misses_header.setMinimumSectionSize(40)
-        self.ui.tv_file_misses.setWordWrap(False)
-        self.ui.tv_file_misses.setTextElideMode(Qt.TextElideMode.ElideMiddle)
+        with self._updates_suspended(self.ui.tv_file_misses):
+            self.ui.tv_file_misses.setModel(self.misses_proxy)
+            self._make_table_compact(self.ui.tv_file_misses)
+            # Rows arrive in pages, so size them via the header default
+            self.ui.tv_file_misses.verticalHeader().setDefaultSectionSize(20)
+
+            misses_header = self.ui.tv_file_misses.horizontalHeader()
+            misses_header.setStretchLastSection(False)
+            misses_header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+            misses_header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+            misses_header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+            misses_header.setMinimumSectionSize(40)
+            self.ui.tv_file_misses.setWordWrap(False)
+            self.ui.tv_file_misses.setTextElideMode(Qt.TextElideMode.ElideMiddle)
+            # Start unsorted (scan order) so rows can be paged in lazily;
+            # picking a sort column pages in the rest first
+            misses_header.sortIndicatorChanged.connect(self._sort_misses)
+            misses_header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+            self.ui.tv_file_misses.setSortingEnabled(True)
 
         # Context menu for misses: "Open in Hex Editor"
         self.ui.tv_file_misses.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.ui.tv_file_misses.customContextMenuRequested.connect(self._show_misses_context_menu)
 
         # --- Rule details table ---
-        self.ui.tv_rule_details.setModel(self.rule_details_proxy)
-        self._make_table_compact(self.ui.tv_rule_details)
-
-        rule_details_header = self.ui.tv_rule_details.horizontalHeader()
-        rule_details_header.setStretchLastSection(True)
-        rule_details_header.setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
-        rule_details_header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        rule_details_header.setDefaultSectionSize(150)
-        rule_details_header.setMinimumSectionSize(80)
-        self.ui.tv_rule_details.setColumnWidth(0, 150)
+        with self._updates_suspended(self.ui.tv_rule_details):
+            self.ui.tv_rule_details.setModel(self.rule_details_proxy)
+            self._make_table_compact(self.ui.tv_rule_details)
+
+            rule_details_header = self.ui.tv_rule_details.horizontalHeader()
+            rule_details_header.setStretchLastSection(True)
+            rule_details_header.setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
+            rule_details_header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+            rule_details_header.setDefaultSectionSize(150)
+            rule_details_header.setMinimumSectionSize(80)
+            self.ui.tv_rule_details.setColumnWidth(0, 150)
 
         # --- Similar files tree ---
-        self.ui.tw_similar_files.setHeaderLabels(['File/Rule', 'Info'])
-        self.ui.tw_similar_files.setAlternatingRowColors(True)
-        self.ui.tw_similar_files.setRootIsDecorated(True)
-        self.ui.tw_similar_files.setItemsExpandable(True)
-        self.ui.tw_similar_files.setSortingEnabled(True)
-        self.ui.tw_similar_files.itemDoubleClicked.connect(self.on_similar_file_double_clicked)
-        self._make_tree_compact(self.ui.tw_similar_files)
+        with self._updates_suspended(self.ui.tw_similar_files):
+            self.ui.tw_similar_files.setModel(self.similar_files_proxy)
+            self.ui.tw_similar_files.setAlternatingRowColors(True)
+            self.ui.tw_similar_files.setRootIsDecorated(True)
+            self.ui.tw_similar_files.setItemsExpandable(True)
+            self.ui.tw_similar_files.doubleClicked.connect(self.on_similar_file_double_clicked)
+            self._make_tree_compact(self.ui.tw_similar_files)
+            self.ui.tw_similar_files.setSortingEnabled(True)
 
         # --- Similar tags tree ---
-        if hasattr(self.ui, 'tw_similar_tags'):
-            self.ui.tw_similar_tags.setHeaderLabels(['Tag/File', 'Details'])
-            self.ui.tw_similar_tags.setAlternatingRowColors(True)
-            self.ui.tw_similar_tags.setRootIsDecorated(True)
-            self.ui.tw_similar_tags.setItemsExpandable(True)
-            self.ui.tw_similar_tags.setSortingEnabled(True)
-            self.ui.tw_similar_tags.itemDoubleClicked.connect(self.on_similar_tag_double_clicked)
-            self._make_tree_compact(self.ui.tw_similar_tags)
+        if self.tw_similar_tags is not None:
+            with self._updates_suspended(self.tw_similar_tags):
+                self.tw_similar_tags.setModel(self.similar_tags_proxy)
+                self.tw_similar_tags.setAlternatingRowColors(True)
+                self.tw_similar_tags.setRootIsDecorated(True)
+                self.tw_similar_tags.setItemsExpandable(True)
+                self.tw_similar_tags.doubleClicked.connect(self.on_similar_tag_double_clicked)
+                self._make_tree_compact(self.tw_similar_tags)
+                self.tw_similar_tags.setSortingEnabled(True)
 
         # --- Match details table ---
         self.setup_match_details_widget()
@@ -138,32 +182,26 @@ class ScanResultsManager(QObject):
         self._inject_search_bars()
 
     def setup_match_details_widget(self):
-        """Setup the YARA match details table widget in tabWidget_4."""
+        """Setup the YARA match details table view in tabWidget_4."""
         self.tw_yara_match_details = self.ui.tw_yara_match_details
+        with self._updates_suspended(self.tw_yara_match_details):
+            self.tw_yara_match_details.setModel(self.match_details_proxy)
 
-        headers = ['File', 'Rule', 'Pattern ID', 'Offset', 'Data Preview', 'Hex Dump', 'Tag']
-        self.tw_yara_match_details.setColumnCount(len(headers))
-        self.tw_yara_match_details.setHorizontalHeaderLabels(headers)
+            self.tw_yara_match_details.setAlternatingRowColors(True)
+            self.tw_yara_match_details.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+            self.tw_yara_match_details.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
 
-        self.tw_yara_match_details.setAlternatingRowColors(True)
-        self.tw_yara_match_details.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.tw_yara_match_details.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        self.tw_yara_match_details.setSortingEnabled(True)
+            header = self.tw_yara_match_details.horizontalHeader()
+            header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+            header.setStretchLastSection(True)
+            for column, width in enumerate(_MATCH_DETAILS_WIDTHS):
+                header.resizeSection(column, width)
 
-        header = self.tw_yara_match_details.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
-        header.setStretchLastSection(True)
-
-        self.tw_yara_match_details.setColumnWidth(0, 200)
-        self.tw_yara_match_details.setColumnWidth(1, 150)
-        self.tw_yara_match_details.setColumnWidth(2, 100)
-        self.tw_yara_match_details.setColumnWidth(3, 100)
-        self.tw_yara_match_details.setColumnWidth(4, 250)
-        self.tw_yara_match_details.setColumnWidth(5, 200)
-        self.tw_yara_match_details.setColumnWidth(6, 100)
-
-        self._make_table_compact(self.tw_yara_match_details)
-        self.tw_yara_match_details.cellDoubleClicked.connect(self.on_match_detail_double_clicked)
+            self._make_table_compact(self.tw_yara_match_details)
+            # Fixed 20px rows via the header default, not per-row setRowHeight
+            self.tw_yara_match_details.verticalHeader().setDefaultSectionSize(20)
+            self.tw_yara_match_details.setSortingEnabled(True)
+        self.tw_yara_match_details.doubleClicked.connect(self.on_match_detail_double_clicked)
 
         # Context menu for "Open in Hex Editor at Offset"
         self.tw_yara_match_details.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
@@ -182,7 +220,7 @@ class ScanResultsManager(QObject):
 
         bar = inject_search_bar(self.ui.horizontalLayout_5, self.ui.tv_file_misses, "Filter misses...")
         if bar:
-            bar.debounced_text_changed.connect(self.misses_proxy.set_filter_text)
+            bar.debounced_text_changed.connect(self._filter_misses)
             self._search_bars['misses'] = bar
 
         bar = inject_search_bar(self.ui.horizontalLayout_7, self.ui.tv_rule_details, "Filter details...")
@@ -193,24 +231,48 @@ class ScanResultsManager(QObject):
         bar = inject_search_bar(self.ui.horizontalLayout_8, self.ui.tw_similar_files, "Filter files...")
         if bar:
             bar.debounced_text_changed.connect(
-                lambda text: filter_tree_widget(self.ui.tw_similar_files, text))
+                lambda text: self._filter_tree(self.ui.tw_similar_files,
+                                               self.similar_files_proxy, text))
             self._search_bars['similar_files'] = bar
 
-        if hasattr(self.ui, 'tw_similar_tags'):
-            bar = inject_search_bar(self.ui.horizontalLayout_2, self.ui.tw_similar_tags, "Filter tags...")
+        if self.tw_similar_tags is not None:
+            bar = inject_search_bar(self.ui.horizontalLayout_2, self.tw_similar_tags, "Filter tags...")
             if bar:
                 bar.debounced_text_changed.connect(
-                    lambda text: filter_tree_widget(self.ui.tw_similar_tags, text))
+                    lambda text: self._filter_tree(self.tw_similar_tags,
+                                                   self.similar_tags_proxy, text))
                 self._search_bars['similar_tags'] = bar
 
         bar = inject_search_bar(self.ui.horizontalLayout_6, self.ui.tw_yara_match_details, "Filter matches...")
         if bar:
-            bar.debounced_text_changed.connect(
-                lambda text: filter_table_widget(self.tw_yara_match_details, text))
+            bar.debounced_text_changed.connect(self.match_details_proxy.set_filter_text)
             self._search_bars['match_details'] = bar
 
     # ─── Table/Tree utility helpers ──────────────────────────────────────
 
+    @contextmanager
+    def deferred_sort(self, table_view):
+        """Keep *table_view* unsorted while rows are bulk-inserted.
+
+        With sorting enabled the proxy re-sorts as rows arrive; disabling
+        it for the duration and re-enabling afterwards sorts once, by the
+        header's current sort column.
+        """
+        table_view.setSortingEnabled(False)
+        try:
+            yield
+        finally:
+            table_view.setSortingEnabled(True)
+
+    @contextmanager
+    def _updates_suspended(self, widget):
+        """Suppress repaints of *widget* while it is being configured."""
+        widget.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            widget.setUpdatesEnabled(True)
+
     def _make_table_compact(self, table_view):
         """Make table rows thin and compact."""
         table_view.verticalHeader().setDefaultSectionSize(18)
@@ -218,6 +280,10 @@ class ScanResultsManager(QObject):
         table_view.verticalHeader().setMaximumSectionSize(20)
         table_view.verticalHeader().setVisible(False)
         table_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        # Cheaper repaints: no grid lines, no hover tracking, no drag autoscroll
+        table_view.setShowGrid(False)
+        table_view.setMouseTracking(False)
+        table_view.setAutoScroll(False)
 
     def _make_tree_compact(self, tree_widget):
         """Make tree widget compact with thin items."""
@@ -229,32 +295,38 @@ class ScanResultsManager(QObject):
         tree_widget.setFont(font)
         tree_widget.setIndentation(15)
 
-    def _apply_column_color(self, item, col_idx):
-        """Apply column-specific background colors to table items."""
-        theme = self.theme_manager.current_theme
-        if not hasattr(theme.colors, 'column_file'):
-            return
+    def _match_column_colors(self) -> List[QColor]:
+        """Column-specific background colors for the match details table.
 
-        colors = theme.colors
-        column_colors = [
-            colors.column_file,
-            colors.column_rule,
-            colors.column_pattern,
-            colors.column_offset,
-            colors.column_data,
-            colors.column_hex,
-            colors.table_background
-        ]
+        Parsed once per theme; repopulating on every selection change
+        reuses the same QColor list.
+        """
+        theme = self.theme_manager.current_theme
+        cache = self._column_colors_cache
+        if cache is not None and cache[0] is theme:
+            return cache[1]
 
-        if col_idx < len(column_colors):
-            item.setBackground(QColor(column_colors[col_idx]))
+        if not hasattr(theme.colors, 'column_file'):
+            column_colors = []
+        else:
+            colors = theme.colors
+            column_colors = [QColor(c) for c in (
+                colors.column_file,
+                colors.column_rule,
+                colors.column_pattern,
+                colors.column_offset,
+                colors.column_data,
+                colors.column_hex,
+                colors.table_background
+            )]
+        self._column_colors_cache = (theme, column_colors)
+        return column_colors
 
     def _force_thin_rows(self, table_view):
-        """Force all existing rows to be thin."""
-        if not table_view.model():
-            return
-        for row in range(table_view.model().rowCount()):
-            table_view.setRowHeight(row, 20)
+        """Force all rows to be thin (20px) via the header default size."""
+        header = table_view.verticalHeader()
+        header.setDefaultSectionSize(20)
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
 
     # ─── Clear helpers ───────────────────────────────────────────────────
 
@@ -263,24 +335,20 @@ class ScanResultsManager(QObject):
         self.rule_details_model.setHorizontalHeaderLabels(['Property', 'Value'])
 
     def clear_similar_files(self):
-        self.ui.tw_similar_files.clear()
-        self.ui.tw_similar_files.setHeaderLabels(['File/Rule', 'Info'])
+        self.similar_files_model.clear()
 
     def clear_match_details(self):
-        self.tw_yara_match_details.setRowCount(0)
+        self.match_details_model.clear()
 
     def clear_all(self):
         """Clear all results views (used by Reset)."""
+        self._hit_index_cache = None
         self.hits_model.clear()
-        self.hits_model.setHorizontalHeaderLabels(['File', 'Size', 'Ext'])
         self.misses_model.clear()
-        self.misses_model.setHorizontalHeaderLabels(['File', 'Size', 'Ext'])
         self.clear_rule_details()
         self.clear_similar_files()
         self.clear_match_details()
-        if hasattr(self.ui, 'tw_similar_tags'):
-            self.ui.tw_similar_tags.clear()
-            self.ui.tw_similar_tags.setHeaderLabels(['Tag/File', 'Details'])
+        self.similar_tags_model.clear()
         self.misses_loaded = False
         for bar in self._search_bars.values():
             bar.clear_filter()
@@ -308,7 +376,7 @@ class ScanResultsManager(QObject):
         if not selected_hits:
             return
 
-        total_rules = len(set(rule['identifier'] for hit in selected_hits for rule in hit['matched_rules']))
+        total_rules = len(set(rule.identifier for hit in selected_hits for rule in hit['matched_rules']))
         total_matches = sum(len(hit['matched_rules']) for hit in selected_hits)
 
         self.add_detail_row('\U0001f50d Total Matches', str(total_matches))
@@ -318,7 +386,7 @@ class ScanResultsManager(QObject):
         for i, hit_data in enumerate(selected_hits):
             filename = hit_data['filename']
             rules_count = len(hit_data['matched_rules'])
-            matched_rule_names = [rule['identifier'] for rule in hit_data['matched_rules']]
+            matched_rule_names = [rule.identifier for rule in hit_data['matched_rules']]
 
             self.add_detail_row(f'\U0001f4c4 File {i+1}', filename)
             self.add_detail_row(f'  \U0001f4cd Path', hit_data['filepath'])
@@ -338,6 +406,24 @@ class ScanResultsManager(QObject):
         self.ui.tv_rule_details.setColumnWidth(0, 120)
         self.ui.tv_rule_details.setWordWrap(True)
 
+    def adopt_hit_index(self, scan_hits: List[Dict], index: HitIndex) -> None:
+        """Use *index*, built by the scan worker as hits came in, for
+        *scan_hits* instead of indexing the list again on first use."""
+        self._hit_index_cache = ((id(scan_hits), len(scan_hits)), index)
+
+    def _hit_index(self, scan_hits: List[Dict]) -> HitIndex:
+        """Index of *scan_hits*, rebuilt only when the list changes.
+
+        MainWindow fills its scan_hits list once per scan (in place), and
+        clear_all() runs before every scan, so identity plus length is
+        enough to spot a stale index.
+        """
+        key = (id(scan_hits), len(scan_hits))
+        cached = self._hit_index_cache
+        if cached is None or cached[0] != key:
+            cached = self._hit_index_cache = (key, HitIndex(scan_hits))
+        return cached[1]
+
     def populate_similar_files(self, scan_hits: List[Dict], selected_filepaths: Optional[Set[str]] = None):
         """
         Populate similar files tree showing files grouped by matching rules.
@@ -347,40 +433,33 @@ class ScanResultsManager(QObject):
             selected_filepaths: If provided, marks these files with stars and filters to their rules.
                                If None, shows all rules from all hits.
         """
-        self.ui.tw_similar_files.clear()
-        self.ui.tw_similar_files.setHeaderLabels(['File/Rule', 'Info'])
-
         if not scan_hits:
+            self.similar_files_model.clear()
             return
 
+        index = self._hit_index(scan_hits)
+
         # Determine which rules to show
         if selected_filepaths:
             # Only show rules that match the selected files
-            target_rules = set()
-            for hit in scan_hits:
-                if hit['filepath'] in selected_filepaths:
-                    for rule_match in hit['matched_rules']:
-                        target_rules.add(rule_match['identifier'])
+            rules_by_file = index.rules_by_file
+            target_rules = frozenset().union(
+                *(rules_by_file[fp] for fp in selected_filepaths if fp in rules_by_file))
         else:
             # Show all rules
-            target_rules = set()
-            for hit in scan_hits:
-                for rule_match in hit['matched_rules']:
-                    target_rules.add(rule_match['identifier'])
+            target_rules = index.hits_by_rule.keys()
 
         # Build rule -> files mapping from ALL scan hits
         rules_to_files: Dict[str, list] = {}
         for rule_name in target_rules:
-            rules_to_files[rule_name] = []
-            for hit_data in scan_hits:
-                hit_rules = {rule['identifier'] for rule in hit_data['matched_rules']}
-                if rule_name in hit_rules:
-                    is_selected = bool(selected_filepaths and hit_data['filepath'] in selected_filepaths)
-                    rules_to_files[rule_name].append({
-                        'filename': hit_data['filename'],
-                        'filepath': hit_data['filepath'],
-                        'is_selected': is_selected
-                    })
+            rules_to_files[rule_name] = [{
+                'filename': hit_data['filename'],
+                'filepath': hit_data['filepath'],
+                'is_selected': bool(selected_filepaths and hit_data['filepath'] in selected_filepaths)
+            } for hit_data in index.hits_by_rule[rule_name]]
+
+        # Rows for the model, swapped in with a single reset at the end
+        groups = []
 
         # Create tree items sorted by file count (most matches first)
         for rule_name in sorted(rules_to_files.keys(), key=lambda r: len(rules_to_files[r]), reverse=True):
@@ -399,20 +478,21 @@ class ScanResultsManager(QObject):
             if selected_count > 0:
                 rule_info += f" ({selected_count} selected)"
 
-            rule_item = QTreeWidgetItem([rule_display, rule_info])
-            rule_item.setToolTip(0, f"Rule: {rule_name}")
-            rule_item.setToolTip(1, f"{total_files} total files matched this rule, {selected_count} currently selected")
+            rule_row = (rule_display, rule_info, f"Rule: {rule_name}",
+                        f"{total_files} total files matched this rule, {selected_count} currently selected",
+                        rule_name)
 
             file_entries_sorted = sorted(file_entries, key=lambda f: (not f['is_selected'], f['filename']))
+            name_counts = Counter(fe['filename'] for fe in file_entries)
 
+            file_rows = []
             for file_entry in file_entries_sorted:
                 filename = file_entry['filename']
                 filepath = file_entry['filepath']
                 is_selected = file_entry['is_selected']
 
                 # Disambiguate same-named files
-                same_name_count = sum(1 for fe in file_entries if fe['filename'] == filename)
-                if same_name_count > 1:
+                if name_counts[filename] > 1:
                     path_parts = filepath.replace('\\', '/').split('/')
                     if len(path_parts) >= 3:
                         distinguishing_path = f".../{path_parts[-3]}/{path_parts[-2]}"
@@ -427,26 +507,15 @@ class ScanResultsManager(QObject):
                 if is_selected:
                     display_name += " \u2b50"
 
-                file_item = QTreeWidgetItem([f"  \U0001f4c4 {display_name}", ""])
-                file_item.setData(0, 32, filepath)  # Qt.UserRole = 32
-
                 tooltip = f"File: {filename}\nPath: {filepath}"
                 if is_selected:
                     tooltip += "\n\u2b50 Currently selected"
-                file_item.setToolTip(0, tooltip)
 
-                rule_item.addChild(file_item)
+                file_rows.append((f"  \U0001f4c4 {display_name}", "", tooltip, "", filepath))
 
-            self.ui.tw_similar_files.addTopLevelItem(rule_item)
-            rule_item.setExpanded(True)
+            groups.append((rule_row, file_rows))
 
-        self.ui.tw_similar_files.resizeColumnToContents(0)
-        self.ui.tw_similar_files.resizeColumnToContents(1)
-
-        # Re-apply filter if search bar has text
-        bar = self._search_bars.get('similar_files')
-        if bar and bar.text():
-            filter_tree_widget(self.ui.tw_similar_files, bar.text())
+        self._show_tree_groups(self.ui.tw_similar_files, self.similar_files_model, groups)
 
     def populate_similar_tags(self, scan_hits: List[Dict], selected_filepaths: Optional[Set[str]] = None):
         """
@@ -457,50 +526,41 @@ class ScanResultsManager(QObject):
             selected_filepaths: If provided, only shows tags from these files and marks them.
                                If None, shows tags from all hits.
         """
-        if not hasattr(self.ui, 'tw_similar_tags'):
+        if self.tw_similar_tags is None:
             return
 
-        self.ui.tw_similar_tags.clear()
-
         if not scan_hits:
+            self.similar_tags_model.clear()
             return
 
+        index = self._hit_index(scan_hits)
+
         # Collect target tags
-        target_tags = set()
-        for hit_data in scan_hits:
-            if selected_filepaths and hit_data.get('filepath', '') not in selected_filepaths:
-                continue
-            for rule_info in hit_data.get('matched_rules', []):
-                for tag in rule_info.get('tags', []):
-                    if tag and tag.strip():
-                        target_tags.add(tag.strip())
+        if selected_filepaths:
+            tags_by_file = index.tags_by_file
+            target_tags = frozenset().union(
+                *(tags_by_file[fp] for fp in selected_filepaths if fp in tags_by_file))
+        else:
+            target_tags = index.entries_by_tag.keys()
 
         if not target_tags:
-            no_tags_item = QTreeWidgetItem(["No tags found", ""])
-            self.ui.tw_similar_tags.addTopLevelItem(no_tags_item)
+            self.similar_tags_model.set_message("No tags found")
             return
 
+        groups = []
+
         # For each tag, find all files with that tag
         for tag in sorted(target_tags):
             files_with_this_tag = []
 
-            for hit_data in scan_hits:
-                filename = hit_data.get('filename', 'Unknown')
+            for hit_data, rule_name in index.entries_by_tag[tag]:
                 filepath = hit_data.get('filepath', '')
-
-                for rule_info in hit_data.get('matched_rules', []):
-                    rule_name = rule_info.get('identifier', 'Unknown')
-                    tags = rule_info.get('tags', [])
-
-                    if any(t.strip() == tag for t in tags if t and t.strip()):
-                        if not any(f['filepath'] == filepath and f['rule_name'] == rule_name for f in files_with_this_tag):
-                            is_selected = bool(selected_filepaths and filepath in selected_filepaths)
-                            files_with_this_tag.append({
-                                'filename': filename,
-                                'filepath': filepath,
-                                'rule_name': rule_name,
-                                'is_selected': is_selected
-                            })
+                files_with_this_tag.append({
+                    'filename': hit_data.get('filename', 'Unknown'),
+                    'filepath': filepath,
+                    'rule_name': rule_name,
+                    'is_selected': bool(selected_filepaths and filepath in selected_filepaths)
+                })
 
             if files_with_this_tag:
                 selected_count = len([f for f in files_with_this_tag if f['is_selected']])
@@ -514,11 +574,11 @@ class ScanResultsManager(QObject):
                 else:
                     tag_info = f"{other_count} files"
 
-                tag_item = QTreeWidgetItem([tag_display, tag_info])
-                tag_item.setToolTip(0, f"Tag: {tag}")
-                tag_item.setToolTip(1, f"Found in {len(files_with_this_tag)} files total")
+                tag_row = (tag_display, tag_info, f"Tag: {tag}",
+                           f"Found in {len(files_with_this_tag)} files total", tag)
 
                 files_sorted = sorted(files_with_this_tag, key=lambda f: (not f['is_selected'], f['filename']))
+                file_rows = []
                 for file_info in files_sorted:
                     if file_info['is_selected']:
                         file_display = f"\U0001f4c4 {file_info['filename']} \u2b50"
@@ -527,173 +587,120 @@ class ScanResultsManager(QObject):
                         file_display = f"\U0001f4c4 {file_info['filename']}"
                         file_info_text = f"Rule: {file_info['rule_name']}"
 
-                    file_item = QTreeWidgetItem([file_display, file_info_text])
-                    file_item.setToolTip(0, f"File: {file_info['filename']}\nPath: {file_info['filepath']}")
-                    file_item.setToolTip(1, f"Rule: {file_info['rule_name']}")
-                    tag_item.addChild(file_item)
+                    file_rows.append((
+                        file_display, file_info_text,
+                        f"File: {file_info['filename']}\nPath: {file_info['filepath']}",
+                        f"Rule: {file_info['rule_name']}",
+                        file_info['filepath']))
+
+                groups.append((tag_row, file_rows))
 
-                self.ui.tw_similar_tags.addTopLevelItem(tag_item)
-                tag_item.setExpanded(True)
+        self._show_tree_groups(self.tw_similar_tags, self.similar_tags_model, groups)
 
-        self.ui.tw_similar_tags.resizeColumnToContents(0)
-        self.ui.tw_similar_tags.resizeColumnToContents(1)
+    def _show_tree_groups(self, tree, model: SimilarTreeModel, groups) -> None:
+        """Swap *groups* into a similar-files/tags model and lay out the view.
 
-        # Re-apply filter if search bar has text
-        bar = self._search_bars.get('similar_tags')
-        if bar and bar.text():
-            filter_tree_widget(self.ui.tw_similar_tags, bar.text())
+        The proxy keeps any filter text across the reset, so the search
+        bar does not need re-applying.
+        """
+        with self._updates_suspended(tree):
+            model.set_groups(groups)
+            tree.expandAll()
+            tree.resizeColumnToContents(0)
+            tree.resizeColumnToContents(1)
+
+    def _filter_tree(self, tree, proxy: TreeFilterProxy, text: str) -> None:
+        with self._updates_suspended(tree):
+            proxy.set_filter_text(text)
+            # Rows the filter brings back would otherwise come back collapsed
+            tree.expandAll()
 
     def populate_match_details(self, selected_hits: List[Dict]):
         """Populate match details table for one or more selected files."""
-        self.tw_yara_match_details.setRowCount(0)
-
         if not selected_hits:
+            self.match_details_model.clear()
             return
 
-        row_count = 0
+        rows = []
 
         for hit_data in selected_hits:
             filename = hit_data['filename']
+            # Slices of the view share the file's buffer; the model only
+            # copies and formats the bytes of rows it actually displays
+            file_view = memoryview(hit_data.get('file_data') or b'')
+            file_len = len(file_view)
 
             for rule_match in hit_data['matched_rules']:
-                rule_name = rule_match['identifier']
-
-                for pattern_info in rule_match.get('patterns', []):
-                    pattern_name = pattern_info['identifier']
-                    for match in pattern_info['matches']:
-                        self.tw_yara_match_details.insertRow(row_count)
+                rule_name = rule_match.identifier
+                tags = rule_match.tags
+                tag_text = ', '.join(tags) if tags else ''
 
-                        self.tw_yara_match_details.setItem(row_count, 0, QTableWidgetItem(filename))
-                        self.tw_yara_match_details.setItem(row_count, 1, QTableWidgetItem(rule_name))
-                        self.tw_yara_match_details.setItem(row_count, 2, QTableWidgetItem(pattern_name))
-                        offset_widget = QTableWidgetItem(f"0x{match['offset']:08x}")
-                        offset_widget.setData(Qt.ItemDataRole.UserRole, match['length'])
-                        self.tw_yara_match_details.setItem(row_count, 3, offset_widget)
-
-                        file_data = hit_data.get('file_data', b'')
-                        offset = match['offset']
-                        length = match['length']
+                for pattern_info in rule_match.patterns:
+                    pattern_name = pattern_info.identifier
+                    for match in pattern_info.matches:
+                        offset = match.offset
+                        length = match.length
 
                         if pattern_name in ['No string matches', 'Condition-based match'] or (offset == 0 and length == 0):
                             data_preview = "Rule matched (no string patterns)"
                             hex_dump = "N/A - Condition-based match"
+                        elif 0 <= offset < file_len and length > 0:
+                            data_preview = hex_dump = file_view[offset:offset + length]
                         else:
-                            preview = self._get_data_preview(offset, length, file_data=file_data)
-                            if preview:
-                                data_preview = preview['text']
-                                hex_dump = preview['hex']
-                            else:
                                 data_preview = f"<offset out of range> ({length} bytes)"
                                 hex_dump = f"Offset: 0x{offset:08x}, Length: {length}"
 
-                        self.tw_yara_match_details.setItem(row_count, 4, QTableWidgetItem(data_preview))
-                        self.tw_yara_match_details.setItem(row_count, 5, QTableWidgetItem(hex_dump))
-
-                        tags = rule_match.get('tags', [])
-                        tag_text = ', '.join(tags) if tags else ''
-                        self.tw_yara_match_details.setItem(row_count, 6, QTableWidgetItem(tag_text))
-
-                        for col in range(7):
-                            item = self.tw_yara_match_details.item(row_count, col)
-                            if item:
-                                self._apply_column_color(item, col)
+                        rows.append((filename, rule_name, pattern_name, offset, length,
+                                     data_preview, hex_dump, tag_text))
 
-                        row_count += 1
-
-        self._force_thin_rows(self.tw_yara_match_details)
-
-        # Re-apply filter if search bar has text
-        bar = self._search_bars.get('match_details')
-        if bar and bar.text():
-            filter_table_widget(self.tw_yara_match_details, bar.text())
+        # One model reset; the proxy keeps any active search filter
+        self.match_details_model.set_rows(rows, self._match_column_colors())
 
     def populate_misses_tab(self, scan_misses: List[Dict]):
         """Populate the misses tab with files that had no matches."""
         if self.misses_loaded:
             return
 
-        self.misses_model.clear()
-        self.misses_model.setHorizontalHeaderLabels(['File', 'Size', 'Ext'])
-
-        for miss_data in scan_misses:
-            filename = miss_data['filename']
-            filepath = miss_data['filepath']
-            file_size = miss_data.get('file_size', 0)
-
-            filename_display = f"\U0001f921 {filename}"
-            filename_item = QStandardItem(filename_display)
-            filename_item.setToolTip(f"File: {filename}\nPath: {filepath}\nStatus: Clean (no threats)")
-            filename_item.setData(filepath, Qt.ItemDataRole.UserRole)
-
-            size_item = QStandardItem(format_size(file_size))
-            size_item.setData(file_size, Qt.ItemDataRole.UserRole)
-            size_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-
-            ext = Path(filename).suffix.lower() if '.' in filename else ''
-            ext_item = QStandardItem(ext)
-
-            self.misses_model.appendRow([filename_item, size_item, ext_item])
+        # Rows are built in pages as the table scrolls (fetchMore)
+        make_row = FileTableModel.make_row
+        self.misses_model.set_lazy_source(
+            scan_misses,
+            lambda miss_data: make_row(
+                f"\U0001f921 {miss_data['filename']}", miss_data['filename'],
+                miss_data['filepath'], miss_data.get('file_size', 0),
+                "Status: Clean (no threats)"))
+
+        # A filter typed or a sort chosen before the tab was opened must
+        # see every row
+        bar = self._search_bars.get('misses')
+        if (bar and bar.text()) or self.misses_proxy.sortColumn() >= 0:
+            self.misses_model.fetch_all()
 
         header = self.ui.tv_file_misses.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
 
-        self._force_thin_rows(self.ui.tv_file_misses)
         self.misses_loaded = True
 
+    def _filter_misses(self, text: str):
+        # The proxy can only filter rows that exist, so page in the rest first
+        if text:
+            self.misses_model.fetch_all()
+        self.misses_proxy.set_filter_text(text)
+
+    def _sort_misses(self, column: int, order: Qt.SortOrder):
+        # Likewise for sorting: the extremes may not be paged in yet
+        if column >= 0:
+            self.misses_model.fetch_all()
+
     def initialize_similar_tags_widget(self):
         """Initialize similar tags widget with instruction message."""
-        if not hasattr(self.ui, 'tw_similar_tags'):
+        if self.tw_similar_tags is None:
             return
-        self.ui.tw_similar_tags.clear()
-        instruction_item = QTreeWidgetItem(["Select a file to see similar tags", ""])
-        instruction_item.setToolTip(0, "Click on a file in the hits table to see files with similar tags")
-        self.ui.tw_similar_tags.addTopLevelItem(instruction_item)
-
-    # ─── Data preview ────────────────────────────────────────────────────
-
-    def _get_data_preview(self, offset: int, length: int,
-                          file_data: Optional[bytes] = None,
-                          filepath: Optional[str] = None) -> Optional[dict]:
-        """
-        Get a preview of data at the specified offset.
-
-        Args:
-            offset: Byte offset into the data
-            length: Number of bytes to read
-            file_data: In-memory file content (preferred)
-            filepath: Path to file on disk (fallback if file_data is None)
-
-        Returns:
-            dict with 'raw', 'text', 'hex' keys, or None
-        """
-        try:
-            if file_data is not None:
-                if offset < 0 or offset >= len(file_data):
-                    return None
-                end_offset = min(offset + length, len(file_data))
-                data = file_data[offset:end_offset]
-            elif filepath:
-                with open(filepath, 'rb') as f:
-                    f.seek(offset)
-                    data = f.read(length)
-            else:
-                return None
-
-            if not data:
-                return None
-
-            text_preview = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in data)
-            hex_dump = ' '.join(f'{b:02X}' for b in data)
-
-            return {
-                'raw': data,
-                'text': text_preview,
-                'hex': hex_dump
-            }
-        except Exception:
-            return None
+        self.similar_tags_model.set_message(
+            "Select a file to see similar tags",
+            "Click on a file in the hits table to see files with similar tags")
 
     # ─── Selection / navigation helpers ──────────────────────────────────
 
@@ -713,23 +720,20 @@ class ScanResultsManager(QObject):
 
     # ─── Double-click handlers ───────────────────────────────────────────
 
-    def on_match_detail_double_clicked(self, row, column):
-        """Handle double-click of a match detail row."""
-        if row < 0:
-            return
-
-        filename_item = self.tw_yara_match_details.item(row, 0)
-        rule_item = self.tw_yara_match_details.item(row, 1)
-        pattern_item = self.tw_yara_match_details.item(row, 2)
-        offset_item = self.tw_yara_match_details.item(row, 3)
+    def _match_cell(self, row: int, col: int) -> str:
+        model = self.match_details_model
+        return model.data(model.index(row, col))
 
-        if not all([filename_item, rule_item, pattern_item, offset_item]):
+    def on_match_detail_double_clicked(self, index):
+        """Handle double-click of a match detail row."""
+        if not index.isValid():
             return
 
-        filename = filename_item.text()
-        rule_name = rule_item.text()
-        pattern_id = pattern_item.text()
-        offset_hex = offset_item.text()
+        row = self.match_details_proxy.mapToSource(index).row()
+        filename = self._match_cell(row, COL_FILE)
+        rule_name = self._match_cell(row, COL_RULE)
+        pattern_id = self._match_cell(row, COL_PATTERN)
+        offset_hex = self._match_cell(row, COL_OFFSET)
 
         try:
             offset = int(offset_hex, 16) if offset_hex.startswith('0x') else int(offset_hex)
@@ -740,7 +744,7 @@ class ScanResultsManager(QObject):
             self.status_message_requested.emit(msg, 5000)
 
         # Request MainWindow to select this file
-        self.file_selection_requested.emit(filename)
+        self._request_navigation(filename)
 
     def _add_file_info_to_menu(self, menu, filepath: str):
         """Add a File Info submenu with hash copy actions."""
@@ -769,14 +773,13 @@ class ScanResultsManager(QObject):
 
     def _show_match_context_menu(self, pos):
         """Show context menu on match details for hex editor navigation."""
-        row = self.tw_yara_match_details.rowAt(pos.y())
-        if row < 0:
+        index = self.tw_yara_match_details.indexAt(pos)
+        if not index.isValid():
             return
 
-        filename_item = self.tw_yara_match_details.item(row, 0)
-        offset_item = self.tw_yara_match_details.item(row, 3)
-        if not filename_item or not offset_item:
-            return
+        row = self.match_details_proxy.mapToSource(index).row()
+        filename = self._match_cell(row, COL_FILE)
+        offset_hex = self._match_cell(row, COL_OFFSET)
 
         menu = QMenu(self.tw_yara_match_details)
         act_hex = menu.addAction("Open in Hex Editor at Offset")
@@ -784,43 +787,35 @@ class ScanResultsManager(QObject):
         act_copy_offset = menu.addAction("Copy Offset")
 
         # Get data preview columns if available
-        data_item = self.tw_yara_match_details.item(row, 4)  # Data Preview
-        hex_item = self.tw_yara_match_details.item(row, 5)   # Hex dump
-        if data_item and data_item.text():
+        data_text = self._match_cell(row, COL_DATA)
+        hex_text = self._match_cell(row, COL_HEX)
+        if data_text:
             act_copy_data = menu.addAction("Copy Data Preview")
         else:
             act_copy_data = None
-        if hex_item and hex_item.text():
+        if hex_text:
             act_copy_hex = menu.addAction("Copy Hex Dump")
         else:
             act_copy_hex = None
 
         action = menu.exec(self.tw_yara_match_details.viewport().mapToGlobal(pos))
         if action == act_hex:
-            filename = filename_item.text()
-            offset_hex = offset_item.text()
-            try:
-                offset = int(offset_hex, 16) if offset_hex.startswith("0x") else int(offset_hex)
-            except ValueError:
-                offset = 0
-
-            match_length = offset_item.data(Qt.ItemDataRole.UserRole)
-            if not match_length or not isinstance(match_length, int):
-                match_length = 0
+            offset = self.match_details_model.offset(row)
+            match_length = self.match_details_model.length(row) or 0
 
             self.hex_editor_requested.emit(filename, offset, match_length)
         elif action == act_copy_path:
             from PySide6.QtWidgets import QApplication
-            QApplication.clipboard().setText(filename_item.text())
+            QApplication.clipboard().setText(filename)
         elif action == act_copy_offset:
             from PySide6.QtWidgets import QApplication
-            QApplication.clipboard().setText(offset_item.text())
+            QApplication.clipboard().setText(offset_hex)
         elif act_copy_data and action == act_copy_data:
             from PySide6.QtWidgets import QApplication
-            QApplication.clipboard().setText(data_item.text())
+            QApplication.clipboard().setText(data_text)
         elif act_copy_hex and action == act_copy_hex:
             from PySide6.QtWidgets import QApplication
-            QApplication.clipboard().setText(hex_item.text())
+            QApplication.clipboard().setText(hex_text)
 
     def _show_misses_context_menu(self, pos):
         """Show context menu on misses table for hex editor."""
@@ -829,14 +824,7 @@ class ScanResultsManager(QObject):
             return
 
         source_index = self.misses_proxy.mapToSource(index)
-        row = source_index.row()
-        filename_item = self.misses_model.item(row, 0)
-        if not filename_item:
-            return
-
-        filepath = filename_item.data(Qt.ItemDataRole.UserRole)
-        if not filepath:
-            filepath = filename_item.toolTip()  # fallback
+        filepath = self.misses_model.filepath(source_index.row())
         if not filepath:
             return
 
@@ -854,69 +842,51 @@ class ScanResultsManager(QObject):
             from PySide6.QtWidgets import QApplication
             QApplication.clipboard().setText(filepath)
 
-    def on_similar_file_double_clicked(self, item, column):
+    def on_similar_file_double_clicked(self, index):
         """Handle double-click of a similar file to synchronize with hits list."""
-        if not item:
+        # File rows carry their path; rule rows (top level) just toggle
+        if not index.isValid() or not index.parent().isValid():
             return
+        filepath = index.siblingAtColumn(0).data(Qt.ItemDataRole.UserRole)
+        if filepath:
+            self._request_navigation(filepath)
 
-        try:
-            filepath = item.data(0, 32)  # Qt.UserRole = 32
-            item_text = item.text(0)
-            has_parent = item.parent() is not None
-        except RuntimeError:
+    def on_similar_tag_double_clicked(self, index):
+        """Handle double-click of a similar tag item.
+
+        A file row selects that file; a tag row selects its first file.
+        Either way the tag is highlighted in the editor.
+        """
+        if not index.isValid():
             return
+        index = index.siblingAtColumn(0)
+        parent = index.parent()
+        if parent.isValid():
+            filepath = index.data(Qt.ItemDataRole.UserRole)
+            tag_name = parent.data(Qt.ItemDataRole.UserRole)
+        else:
+            first_child = index.model().index(0, 0, index)
+            filepath = first_child.data(Qt.ItemDataRole.UserRole) if first_child.isValid() else None
+            tag_name = index.data(Qt.ItemDataRole.UserRole)
 
         if filepath:
-            self.file_selection_requested.emit(filepath)
-        else:
-            filename = None
-            if item_text.startswith('\U0001f4c4 '):
-                filename = item_text[2:].split(' (')[0]
-                filename = filename.replace(' \u2b50', '').strip()
-            elif item_text.startswith('File: '):
-                filename = item_text[6:]
-            elif not has_parent:
-                if not any(keyword in item_text.lower() for keyword in ['rule', 'condition', 'strings', 'meta']):
-                    filename = item_text
-
-            if filename:
-                self.file_selection_requested.emit(filename)
-
-    def on_similar_tag_double_clicked(self, item, column):
-        """Handle double-click of a similar tag item."""
-        if not item:
-            return
+            self._request_navigation(filepath, tag_name)
 
-        try:
-            item_text = item.text(0)
-            parent_item = item.parent()
-            parent_text = parent_item.text(0) if parent_item else None
-            child_count = item.childCount()
-            first_child = item.child(0) if child_count > 0 else None
-        except RuntimeError:
-            return
+    def _request_navigation(self, identifier: str, tag: Optional[str] = None):
+        """Queue a hits-table selection (and optional tag highlight).
 
-        filename = None
-        tag_name = None
-
-        if item_text.startswith('\U0001f4c4 '):
-            filename = item_text[2:]
-            filename = filename.replace(' \u2b50', '').strip()
-        elif item_text.startswith('\U0001f3f7\ufe0f '):
-            tag_name = item_text[3:]
-            if first_child:
-                try:
-                    first_child_text = first_child.text(0)
-                    if first_child_text.startswith('\U0001f4c4 '):
-                        filename = first_child_text[2:]
-                        filename = filename.replace(' \u2b50', '').strip()
-                except RuntimeError:
-                    pass
-
-        if filename:
-            self.file_selection_requested.emit(filename)
-
-            if tag_name or (parent_text and parent_text.startswith('\U0001f3f7\ufe0f ')):
-                parent_tag = tag_name if tag_name else (parent_text[3:] if parent_text else None)
-                if parent_tag:
-                    self.tag_highlight_requested.emit(parent_tag)
+        Selecting a hit repopulates every results pane, so this is deferred
+        to the event loop and only the most recent request is acted on.
+        """
+        if self._pending_nav is None:
+            QTimer.singleShot(0, self._process_pending_nav)
+        self._pending_nav = (identifier, tag)
+
+    def _process_pending_nav(self):
+        pending, self._pending_nav = self._pending_nav, None
+        if pending is None:
+            return
+        identifier, tag = pending
+        self.file_selection_requested.emit(identifier)
+        if tag:
+            self.tag_highlight_requested.emit(tag)
@@ -7,24 +7,26 @@ No UI dependencies. Returns data or raises exceptions for the caller to handle.
 """
 
 import hashlib
+import importlib.metadata
+import importlib.util
+import os
 import re
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
-
-# Check if yara_x is available
-try:
-    import yara_x
-    YARA_X_AVAILABLE = True
-except ImportError:
-    YARA_X_AVAILABLE = False
-
-# Check if yaraast is available
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Check if yara_x / yaraast are available without importing them: yara_x
+# loads its native library on import, so the modules themselves are only
+# imported inside the methods that use them. Looking up the yaraast
+# submodules imports just their parent packages (and raises if those are
+# missing).
+YARA_X_AVAILABLE = importlib.util.find_spec("yara_x") is not None
 try:
-    import yaraast
-    from yaraast.parser.better_parser import Parser
-    from yaraast.codegen import CodeGenerator
-    YARAAST_AVAILABLE = True
+    YARAAST_AVAILABLE = all(importlib.util.find_spec(name) is not None
+                            for name in ("yaraast.parser.better_parser", "yaraast.codegen"))
 except ImportError:
     YARAAST_AVAILABLE = False
 
@@ -69,6 +71,86 @@ class SizeBounds:
         return False
 
 
+# ── Match records ─────────────────────────────────────────────────
+# A scan hit keeps one RuleMatch per matching rule for the rest of the
+# session (results views, hex editor). Slotted objects are several times
+# smaller than the equivalent dicts, which adds up at one MatchSpan per
+# string match.
+
+class MatchSpan:
+    """One string match: byte offset and length in the scanned data."""
+    __slots__ = ('offset', 'length')
+
+    def __init__(self, offset: int, length: int):
+        self.offset = offset
+        self.length = length
+
+
+class PatternMatch:
+    """A pattern (string) of a rule together with its matches."""
+    __slots__ = ('identifier', 'matches')
+
+    def __init__(self, identifier: str, matches: List[MatchSpan]):
+        self.identifier = identifier
+        self.matches = matches
+
+
+class RuleMatch:
+    """A rule that matched a file, with the patterns that matched."""
+    __slots__ = ('identifier', 'namespace', 'tags', 'metadata', 'patterns')
+
+    def __init__(self, identifier: str, namespace: str, tags: List[str],
+                 metadata: Dict, patterns: List[PatternMatch]):
+        self.identifier = identifier
+        self.namespace = namespace
+        self.tags = tags
+        self.metadata = metadata
+        self.patterns = patterns
+
+
+class HitIndex:
+    """Rule and tag lookups over one scan's hits.
+
+    The similar-files/tags views are rebuilt on every selection change;
+    with these they walk only the rules and tags they display instead of
+    rescanning every hit for each one. ScanWorker fills an index as hits
+    come in, so the results views get it ready-made.
+    """
+
+    def __init__(self, scan_hits: Iterable[Dict] = ()):
+        self.rules_by_file: Dict[str, FrozenSet[str]] = {}
+        self.tags_by_file: Dict[str, FrozenSet[str]] = {}
+        # rule -> hits that matched it, in scan order
+        self.hits_by_rule: Dict[str, List[Dict]] = {}
+        # tag -> (hit, rule name) pairs, one per file and rule, in scan order
+        self.entries_by_tag: Dict[str, List[Tuple[Dict, str]]] = {}
+        self._seen_tag_entries: Set[Tuple[str, str, str]] = set()
+        for hit in scan_hits:
+            self.add(hit)
+
+    def add(self, hit: Dict) -> None:
+        """Index one hit dict (as returned by :meth:`YaraScanner.scan_data`)."""
+        filepath = hit.get('filepath', '')
+        rules: Set[str] = set()
+        tags: Set[str] = set()
+        for rule_info in hit.get('matched_rules', []):
+            rule_name = rule_info.identifier
+            if rule_name not in rules:
+                rules.add(rule_name)
+                self.hits_by_rule.setdefault(rule_name, []).append(hit)
+            for tag in rule_info.tags:
+                tag = tag.strip() if tag else ''
+                if not tag:
+                    continue
+                tags.add(tag)
+                key = (tag, filepath, rule_name)
+                if key not in self._seen_tag_entries:
+                    self._seen_tag_entries.add(key)
+                    self.entries_by_tag.setdefault(tag, []).append((hit, rule_name))
+        self.rules_by_file[filepath] = self.rules_by_file.get(filepath, frozenset()) | rules
+        self.tags_by_file[filepath] = self.tags_by_file.get(filepath, frozenset()) | tags
+
+
 # Flip the operator when the operands are swapped (e.g. `N < filesize`
 # becomes `filesize > N`).
 _OP_FLIP = {"<": ">", "<=": ">=", ">": "<", ">=": "<=",
@@ -421,9 +503,73 @@ def format_size(n: int) -> str:
     return f"{n / (1024 ** 3):.2f} GB"
 
 
+# Compiled rulesets kept by YaraScanner.compile_rules (most recent last)
+_COMPILED_CACHE_SIZE = 4
+# Serialized rulesets kept on disk across restarts (least recently used
+# files are removed beyond this)
+_DISK_CACHE_SIZE = 100
+# Both caches are keyed on the rule text alone, which does not cover the
+# contents of included files
+_INCLUDE_RE = re.compile(r'^\s*include\s+"', re.MULTILINE)
+
+
+def _rules_cache_dir() -> Path:
+    """Per-user cache directory for serialized compiled rules."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "YaraXGUI" / "rules"
+
+
+def _yara_x_version() -> str:
+    # The serialized format is tied to the yara-x release that wrote it
+    try:
+        return importlib.metadata.version("yara-x")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+# Hit files at least this large have their three digests computed
+# concurrently (hashlib releases the GIL while hashing large buffers)
+_PARALLEL_HASH_BYTES = 1 << 20
+# Threads are only started on first use
+_HASH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hash")
+
+
+def _file_hashes(data: bytes) -> Tuple[str, str, str]:
+    """(md5, sha1, sha256) hex digests of *data*.
+
+    The digests only identify files, so they are created with
+    ``usedforsecurity=False``. For large buffers, MD5 and SHA1 run on a
+    shared two-thread pool while SHA256 runs on the calling thread.
+    """
+    md5 = hashlib.md5(usedforsecurity=False)
+    sha1 = hashlib.sha1(usedforsecurity=False)
+    sha256 = hashlib.sha256(usedforsecurity=False)
+    if len(data) < _PARALLEL_HASH_BYTES:
+        md5.update(data)
+        sha1.update(data)
+        sha256.update(data)
+    else:
+        pending = [_HASH_POOL.submit(md5.update, data),
+                   _HASH_POOL.submit(sha1.update, data)]
+        sha256.update(data)
+        for future in pending:
+            future.result()
+    return md5.hexdigest(), sha1.hexdigest(), sha256.hexdigest()
+
+
 class YaraScanner:
     """Pure-logic YARA scanning, compilation, formatting, and validation."""
 
+    def __init__(self):
+        # blake2b digest of the rule text -> compiled yara_x.Rules
+        self._compiled_cache: Dict[bytes, object] = {}
+        # True when the last compile_rules() call didn't compile
+        self.last_compile_cached = False
+
     def format_with_yara_x(self, text: str) -> str:
         """
         Format YARA rules using yara-x Formatter.
@@ -440,6 +586,8 @@ class YaraScanner:
         try:
             from io import BytesIO, StringIO
 
+            import yara_x
+
             # Strip leading/trailing whitespace so stray indentation
             # from pasting doesn't leak into the formatted output.
             text = text.strip()
@@ -477,6 +625,9 @@ class YaraScanner:
             raise RuntimeError("yaraast is not installed")
 
         try:
+            from yaraast.codegen import CodeGenerator
+            from yaraast.parser.better_parser import Parser
+
             parser = Parser()
             ast = parser.parse(text)
             codegen = CodeGenerator()
@@ -491,6 +642,8 @@ class YaraScanner:
             return {"valid": None, "message": "yaraast not available for syntax validation"}
 
         try:
+            from yaraast.parser.better_parser import Parser
+
             parser = Parser()
             ast = parser.parse(text)
 
@@ -561,6 +714,15 @@ class YaraScanner:
         """
         Compile YARA rules and return compiled rules object.
 
+        Compiled rules are immutable, so the last few rulesets are cached
+        by a digest of their text; scanning again with unchanged rules
+        reuses the compiled object instead of recompiling. Compiled
+        rulesets are also serialized to a per-user cache directory and
+        loaded from there after a restart. ``last_compile_cached`` tells
+        whether either cache was used. Rulesets with ``include``
+        directives are always compiled, as an included file may have
+        changed since.
+
         Returns:
             Compiled rules object
 
@@ -571,7 +733,64 @@ class YaraScanner:
         if not YARA_X_AVAILABLE:
             raise RuntimeError("YARA-X not installed. Please install with: pip install yara-x")
 
-        return yara_x.compile(rule_text)
+        if _INCLUDE_RE.search(rule_text):
+            import yara_x
+            self.last_compile_cached = False
+            return yara_x.compile(rule_text)
+
+        key = hashlib.blake2b(rule_text.encode('utf-8'), digest_size=16).digest()
+        rules = self._compiled_cache.pop(key, None)
+        self.last_compile_cached = rules is not None
+        if rules is None:
+            cache_path = _rules_cache_dir() / f"{key.hex()}-{_yara_x_version()}.yrxc"
+            rules = self._load_cached_rules(cache_path)
+            self.last_compile_cached = rules is not None
+            if rules is None:
+                import yara_x
+                rules = yara_x.compile(rule_text)
+                self._store_cached_rules(rules, cache_path)
+            if len(self._compiled_cache) >= _COMPILED_CACHE_SIZE:
+                del self._compiled_cache[next(iter(self._compiled_cache))]
+        self._compiled_cache[key] = rules
+        return rules
+
+    @staticmethod
+    def _load_cached_rules(cache_path: Path):
+        """Deserialize rules from the disk cache, or None on any failure."""
+        try:
+            import yara_x
+            with open(cache_path, 'rb') as f:
+                rules = yara_x.Rules.deserialize_from(f)
+            os.utime(cache_path)  # mark as recently used
+            return rules
+        except Exception:
+            return None
+
+    @staticmethod
+    def _store_cached_rules(rules, cache_path: Path) -> None:
+        """Serialize *rules* to the disk cache (best effort) and evict
+        the least recently used files beyond ``_DISK_CACHE_SIZE``."""
+        tmp_path = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Unique temp name: another running instance may be caching
+            # the same rules at the same time
+            with tempfile.NamedTemporaryFile(dir=cache_path.parent, suffix='.tmp',
+                                             delete=False) as f:
+                tmp_path = f.name
+                rules.serialize_into(f)
+            os.replace(tmp_path, cache_path)
+            tmp_path = None
+            cached = sorted(cache_path.parent.glob('*.yrxc'),
+                            key=lambda p: p.stat().st_mtime)
+            for old in cached[:-_DISK_CACHE_SIZE]:
+                old.unlink()
+        except Exception:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
 
     def scan_file(self, rules, file_path: Path) -> dict:
         """
@@ -580,68 +799,61 @@ class YaraScanner:
         Returns:
             dict with keys: 'hit' (bool), 'filename', 'filepath', 'md5', 'sha1', 'sha256',
             and if hit: 'file_data', 'matched_rules'
+
+        Hashes are only computed for hits (the hit details show them);
+        misses carry empty strings, like size-skipped files, and the
+        "Copy MD5/SHA1/SHA256" menus hash from disk on demand.
         """
-        data = file_path.read_bytes()
-        md5_hash = hashlib.md5(data).hexdigest()
-        sha1_hash = hashlib.sha1(data).hexdigest()
-        sha256_hash = hashlib.sha256(data).hexdigest()
+        return self.scan_data(rules, file_path, file_path.read_bytes())
 
-        results = rules.scan(data)
+    def scan_data(self, rules, file_path: Path, data: bytes) -> dict:
+        """:meth:`scan_file` for contents the caller has already read.
 
-        filename = file_path.name
-        filepath = str(file_path)
+        *rules* may also be a ``yara_x.Scanner`` built from the compiled
+        rules; both have the same ``scan(data)``.
+        """
+        results = rules.scan(data)
 
         base = {
-            'filename': filename,
-            'filepath': filepath,
+            'filename': file_path.name,
+            'filepath': str(file_path),
             'file_size': len(data),
-            'md5': md5_hash,
-            'sha1': sha1_hash,
-            'sha256': sha256_hash,
         }
 
         if results.matching_rules:
             matched_rules = self._extract_match_details(results.matching_rules)
-            return {**base, 'hit': True, 'file_data': data, 'matched_rules': matched_rules}
+            md5_hash, sha1_hash, sha256_hash = _file_hashes(data)
+            return {**base,
+                    'md5': md5_hash,
+                    'sha1': sha1_hash,
+                    'sha256': sha256_hash,
+                    'hit': True, 'file_data': data, 'matched_rules': matched_rules}
         else:
-            return {**base, 'hit': False}
+            return {**base, 'md5': '', 'sha1': '', 'sha256': '', 'hit': False}
 
-    def _extract_match_details(self, matching_rules) -> List[Dict]:
+    def _extract_match_details(self, matching_rules) -> List[RuleMatch]:
         """Extract detailed information from matching rules."""
         matched_rules = []
 
         for rule in matching_rules:
-            rule_info = {
-                'identifier': rule.identifier,
-                'namespace': rule.namespace,
-                'tags': list(rule.tags) if hasattr(rule, 'tags') else [],
-                'metadata': dict(rule.metadata) if hasattr(rule, 'metadata') else {},
-                'patterns': []
-            }
-
-            has_string_matches = False
-            for pattern in rule.patterns:
-                if pattern.matches:
-                    has_string_matches = True
-                    pattern_info = {
-                        'identifier': pattern.identifier,
-                        'matches': [
-                            {
-                                'offset': match.offset,
-                                'length': match.length
-                            } for match in pattern.matches
-                        ]
-                    }
-                    rule_info['patterns'].append(pattern_info)
+            patterns = [
+                PatternMatch(pattern.identifier,
+                             [MatchSpan(match.offset, match.length)
+                              for match in pattern.matches])
+                for pattern in rule.patterns if pattern.matches
+            ]
 
             # If rule matched but has no string pattern matches (condition-based match)
-            if not has_string_matches:
-                rule_info['patterns'].append({
-                    'identifier': 'Condition-based match',
-                    'matches': [{'offset': 0, 'length': 0}]
-                })
-
-            matched_rules.append(rule_info)
+            if not patterns:
+                patterns.append(PatternMatch('Condition-based match', [MatchSpan(0, 0)]))
+
+            matched_rules.append(RuleMatch(
+                rule.identifier,
+                rule.namespace,
+                list(rule.tags) if hasattr(rule, 'tags') else [],
+                dict(rule.metadata) if hasattr(rule, 'metadata') else {},
+                patterns,
+            ))
 
         return matched_rules
 
@@ -2,7 +2,8 @@
 
 """
 ScanWorker — QThread wrapper around YaraScanner so large file-set scans
-don't hang the UI.
+don't hang the UI. FormatWorker does the same for "Format YARA", which
+compiles and re-prints the whole rule text.
 
 Keeps ``scanner.py`` Qt-free: this module is the thin bridge between the
 pure-logic scanner and the Qt main window.
@@ -10,11 +11,13 @@ pure-logic scanner and the Qt main window.
 Signals
 -------
 progress(scanned:int, total:int, filename:str)
-    Emitted after each file is processed.  ``filename`` is the base name
-    of the file that just finished scanning (useful for status text).
+    Emitted as files finish, at most every ``_PROGRESS_INTERVAL`` seconds
+    (and always for the last file).  ``filename`` is the base name of the
+    file that just finished scanning (useful for status text).
 result_ready(dict)
     Emitted exactly once when the thread finishes.  Mirrors the dict
-    returned by :meth:`YaraScanner.scan_files` plus a ``cancelled`` bool.
+    returned by :meth:`YaraScanner.scan_files` plus a ``cancelled`` bool
+    and a ``hit_index`` (:class:`scanner.HitIndex` over the hits).
 error(str)
     Emitted if the worker itself crashes (not per-file errors — those are
     bundled into the result under ``error_messages``).
@@ -22,16 +25,63 @@ error(str)
 
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 
 from PySide6.QtCore import QThread, Signal
 
-from scanner import SizeBounds, YaraScanner
+from scanner import HitIndex, SizeBounds, YaraScanner, YARA_X_AVAILABLE, YARAAST_AVAILABLE
+
+
+def _usable_cpus() -> int:
+    """Cores this process may run on (affinity/cpuset aware where the OS
+    reports it, e.g. in CPU-limited containers)."""
+    if hasattr(os, 'sched_getaffinity'):
+        try:
+            return max(1, len(os.sched_getaffinity(0)))
+        except OSError:
+            pass
+    return os.cpu_count() or 1
+
+
+def _scan_workers() -> int:
+    """Pool size for ScanWorker: one thread per usable core plus one, so a
+    thread blocked reading a file doesn't leave a core idle; capped at 8."""
+    return min(8, _usable_cpus() + 1)
+
+
+# Duplicate detection (see ScanWorker._copy_of_duplicate): files are first
+# matched on size plus a digest of their first and last few KiB, which
+# covers small files entirely; larger candidates are confirmed with a
+# full digest before a result is reused.
+_DEDUP_EDGE = 4096
+
+# Minimum seconds between progress signals: each one is a queued call
+# that repaints the progress bar and status text on the UI thread.
+_PROGRESS_INTERVAL = 0.1
+
+
+def _edge_key(data: bytes) -> tuple:
+    edges = data[:_DEDUP_EDGE] + data[-_DEDUP_EDGE:]
+    return len(data), hashlib.blake2b(edges, digest_size=16).digest()
+
+
+def _full_digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=32).digest()
 
 
 class ScanWorker(QThread):
-    """Runs :meth:`YaraScanner.scan_file` over a file list on a worker thread."""
+    """Scans a file list on a worker thread.
+
+    Each file is read once and passed to :meth:`YaraScanner.scan_data`
+    with a per-thread ``yara_x.Scanner`` (see :meth:`_thread_scanner`).
+    """
 
     progress = Signal(int, int, str)     # scanned, total, current_file_name
     result_ready = Signal(dict)          # hits/misses/stats/error_messages/cancelled
@@ -49,6 +99,12 @@ class ScanWorker(QThread):
         self._files = list(files)
         self._size_bounds = size_bounds or SizeBounds()
         self._cancel = False
+        # Edge key -> [[path, kind, result, full digest or None], ...],
+        # one entry per distinct content scanned with that key
+        self._seen: dict = {}
+        self._seen_lock = threading.Lock()
+        # Per pool thread yara_x.Scanner, see _thread_scanner()
+        self._local = threading.local()
 
     def cancel(self):
         """Request a graceful stop. The worker checks this between files."""
@@ -57,34 +113,45 @@ class ScanWorker(QThread):
     def is_cancelled(self) -> bool:
         return self._cancel
 
-    def run(self):
-        """Scan loop (runs on the worker thread)."""
-        try:
-            hits: list = []
-            misses: list = []
-            error_messages: list = []
-            stats = {'scanned': 0, 'matches': 0, 'errors': 0, 'skipped': 0}
-            total = len(self._files)
-            bounds = self._size_bounds
+    def _thread_scanner(self):
+        """The calling pool thread's ``yara_x.Scanner`` for the rules.
 
-            for idx, file_path in enumerate(self._files, start=1):
-                if self._cancel:
-                    break
+        A Scanner is reused for every file the thread scans, where
+        ``Rules.scan()`` sets up a fresh scan context per call. Scanners
+        can't be shared between threads, hence one per thread. Falls back
+        to the rules object itself if a Scanner can't be created.
+        """
+        scanner = getattr(self._local, 'scanner', None)
+        if scanner is None:
+            try:
+                import yara_x
+                scanner = yara_x.Scanner(self._rules)
+            except Exception:
+                scanner = self._rules
+            self._local.scanner = scanner
+        return scanner
 
-                stats['scanned'] += 1
+    def _scan_one(self, file_path: Path):
+        """Scan one file (runs on a pool thread).
 
+        Returns ``(kind, payload)`` where kind is 'hit', 'miss' or 'skipped'
+        with the result dict, 'denied' with None, or 'error' with the
+        error message.
+        """
+        bounds = self._size_bounds
+        try:
+            # One open per file: the size pre-filter fstat()s the handle
+            # the contents are then read from, instead of a separate
+            # path stat() ahead of the read.
+            with open(file_path, 'rb') as f:
                 # Pre-filter by file size. If the ruleset has a usable
                 # upper/lower bound on `filesize`, files outside that
                 # range cannot possibly match any rule — skip them
                 # without reading their contents.
                 if bounds.is_useful():
-                    try:
-                        fsize = file_path.stat().st_size
-                    except OSError:
-                        fsize = None
-                    if fsize is not None and bounds.can_skip(fsize):
-                        stats['skipped'] += 1
-                        misses.append({
+                    fsize = os.fstat(f.fileno()).st_size
+                    if bounds.can_skip(fsize):
+                        return 'skipped', {
                             'filename': file_path.name,
                             'filepath': str(file_path),
                             'md5': '',
@@ -95,33 +162,115 @@ class ScanWorker(QThread):
                                 f"filesize {fsize} bytes outside rule bounds"
                             ),
                             'file_size': fsize,
-                        })
-                        self.progress.emit(idx, total, file_path.name)
+                        }
+                data = f.read()
+            key = _edge_key(data)
+            duplicate, digest = self._copy_of_duplicate(key, data, file_path)
+            if duplicate is not None:
+                return duplicate
+            result = self._scanner.scan_data(self._thread_scanner(), file_path, data)
+        except PermissionError:
+            return 'denied', None
+        except Exception as e:
+            return 'error', f"\u2717 Error scanning {file_path}: {e}"
+        kind = 'hit' if result.pop('hit', None) else 'miss'
+        with self._seen_lock:
+            self._seen.setdefault(key, []).append([file_path, kind, result, digest])
+        return kind, result
+
+    def _copy_of_duplicate(self, key: tuple, data: bytes, file_path: Path):
+        """Reuse an earlier file's result if *data* has the same contents.
+
+        Returns ``((kind, result), None)`` with the result relabelled for
+        *file_path*, or ``(None, digest)`` when the file has to be scanned
+        (*digest* is its full digest if one was computed, else None).
+        Identical files (copies, backups, repeated samples) are then
+        scanned only once per scan.
+        """
+        with self._seen_lock:
+            entries = list(self._seen.get(key, ()))
+        if not entries:
+            return None, None
+        digest = None
+        for entry in entries:
+            seen_path, kind, seen_result, seen_digest = entry
+            if len(data) > 2 * _DEDUP_EDGE:
+                # The edge key only samples larger files: compare full
+                # digests (an earlier file is re-read at most once)
+                if seen_digest is None:
+                    try:
+                        seen_digest = _full_digest(seen_path.read_bytes())
+                    except OSError:
                         continue
+                    entry[3] = seen_digest
+                if digest is None:
+                    digest = _full_digest(data)
+                if digest != seen_digest:
+                    continue
+            return (kind, dict(seen_result, filename=file_path.name,
+                               filepath=str(file_path))), None
+        return None, digest
 
-                try:
-                    result = self._scanner.scan_file(self._rules, file_path)
-                    if result.get('hit'):
+    def run(self):
+        """Scan loop (runs on the worker thread).
+
+        Files are scanned on a small thread pool: reading, hashing and
+        yara-x scanning spend most of their time outside the GIL. Results
+        are consumed in file order, and at most ``2 * workers`` files are
+        in flight, so a cancel takes effect within a few files and results
+        don't pile up in memory.
+        """
+        try:
+            hits: list = []
+            hit_index = HitIndex()
+            misses: list = []
+            error_messages: list = []
+            stats = {'scanned': 0, 'matches': 0, 'errors': 0, 'skipped': 0}
+            total = len(self._files)
+            files = iter(self._files)
+            workers = _scan_workers()
+            in_flight: deque = deque()   # (future, file name), in file order
+            last_progress = time.monotonic()
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                while True:
+                    while not self._cancel and len(in_flight) < 2 * workers:
+                        file_path = next(files, None)
+                        if file_path is None:
+                            break
+                        in_flight.append((pool.submit(self._scan_one, file_path),
+                                          file_path.name))
+                    if not in_flight:
+                        break
+
+                    future, file_name = in_flight.popleft()
+                    kind, payload = future.result()
+                    stats['scanned'] += 1
+                    if kind == 'hit':
                         stats['matches'] += 1
-                        result.pop('hit', None)
-                        hits.append(result)
+                        hits.append(payload)
+                        hit_index.add(payload)
+                    elif kind == 'miss':
+                        misses.append(payload)
+                    elif kind == 'skipped':
+                        stats['skipped'] += 1
+                        misses.append(payload)
                     else:
-                        result.pop('hit', None)
-                        misses.append(result)
-                except PermissionError:
-                    stats['errors'] += 1
-                except Exception as e:
-                    stats['errors'] += 1
-                    error_messages.append(
-                        f"\u2717 Error scanning {file_path}: {e}"
-                    )
-
-                # Emit progress AFTER the file is done so "scanned" is accurate.
-                # Qt queues this across threads automatically.
-                self.progress.emit(idx, total, file_path.name)
+                        stats['errors'] += 1
+                        if kind == 'error':
+                            error_messages.append(payload)
+
+                    # Emit progress AFTER the file is done so "scanned" is accurate.
+                    # Qt queues this across threads automatically.
+                    now = time.monotonic()
+                    if (now - last_progress >= _PROGRESS_INTERVAL
+                            or stats['scanned'] == total):
+                        self.progress.emit(stats['scanned'], total, file_name)
+                        last_progress = now
 
             self.result_ready.emit({
                 'hits': hits,
+                'hit_index': hit_index,
                 'misses': misses,
                 'stats': stats,
                 'error_messages': error_messages,
@@ -130,3 +279,65 @@ class ScanWorker(QThread):
         except Exception as e:
             # Catch-all: something in the scanner itself blew up.
             self.error.emit(f"Scanner thread crashed: {e}")
+
+
+def _strip_extra_braces(source: str, formatted: str) -> str:
+    """Work around yara-x formatter bugs that add extra closing braces.
+
+    Strips trailing "}" one at a time until the count matches *source*,
+    then re-validates; the formatter output is kept if the fix breaks it.
+    """
+    in_open = source.count('{')
+    in_close = source.count('}')
+    if formatted.count('}') <= in_close or formatted.count('{') != in_open:
+        return formatted
+    fixed = formatted
+    while fixed.count('}') > in_close:
+        idx = fixed.rfind('}')
+        if idx == -1:
+            break
+        fixed = fixed[:idx] + fixed[idx + 1:]
+    fixed = fixed.strip()
+    try:
+        import yara_x
+        yara_x.compile(fixed)
+        return fixed
+    except Exception:
+        return formatted
+
+
+class FormatWorker(QThread):
+    """Formats rule text with yara-x (or the yaraast fallback) off the UI thread.
+
+    ``result_ready(text, engine)`` or ``error(engine, message)`` is emitted
+    once, unless :meth:`cancel` was called first; the formatter call itself
+    cannot be interrupted, so cancelling only drops its result.
+    """
+
+    result_ready = Signal(str, str)      # formatted text, engine name
+    error = Signal(str, str)             # engine name, error message
+
+    def __init__(self, scanner: YaraScanner, text: str, parent=None):
+        super().__init__(parent)
+        self._scanner = scanner
+        self._text = text
+        self._cancel = False
+
+    def cancel(self):
+        """Discard the result once the formatter returns."""
+        self._cancel = True
+
+    def run(self):
+        engine = 'yara-x' if YARA_X_AVAILABLE else 'yaraast'
+        try:
+            if YARA_X_AVAILABLE:
+                formatted = _strip_extra_braces(
+                    self._text, self._scanner.format_with_yara_x(self._text))
+            else:
+                formatted = self._scanner.format_with_ast(self._text)
+        except Exception as e:
+            if not self._cancel:
+                self.error.emit(engine, str(e))
+            return
+        if not self._cancel:
+            self.result_ready.emit(formatted, engine)
@@ -4,7 +4,7 @@
 Reusable search/filter components for scan result tables and trees.
 
 Provides debounced search bars, proxy filter models, and helper functions
-to inject filtering into existing QTableView, QTreeWidget, and QTableWidget layouts.
+to inject filtering into existing QTableView and QTreeView layouts.
 """
 
 from PySide6.QtCore import QSortFilterProxyModel, Qt, QTimer, Signal
@@ -61,56 +61,24 @@ class MultiColumnFilterProxy(QSortFilterProxyModel):
         return False
 
 
-def filter_tree_widget(tree, text: str):
-    """Hide/show QTreeWidget items based on text match.
+class TreeFilterProxy(MultiColumnFilterProxy):
+    """MultiColumnFilterProxy for two-level trees.
 
     - Parent visible if it matches OR any child matches.
     - If parent matches, all children are shown.
     - Empty text shows everything.
     """
-    text = text.lower()
-    for i in range(tree.topLevelItemCount()):
-        parent = tree.topLevelItem(i)
-        if not text:
-            parent.setHidden(False)
-            for j in range(parent.childCount()):
-                parent.child(j).setHidden(False)
-            continue
-
-        parent_text = " ".join(parent.text(c) for c in range(parent.columnCount())).lower()
-        parent_matches = text in parent_text
-
-        if parent_matches:
-            parent.setHidden(False)
-            for j in range(parent.childCount()):
-                parent.child(j).setHidden(False)
-        else:
-            any_child = False
-            for j in range(parent.childCount()):
-                child = parent.child(j)
-                child_text = " ".join(child.text(c) for c in range(child.columnCount())).lower()
-                if text in child_text:
-                    child.setHidden(False)
-                    any_child = True
-                else:
-                    child.setHidden(True)
-            parent.setHidden(not any_child)
-
-
-def filter_table_widget(table, text: str):
-    """Hide/show QTableWidget rows based on text match across all columns."""
-    text = text.lower()
-    for row in range(table.rowCount()):
-        if not text:
-            table.setRowHidden(row, False)
-            continue
-        visible = False
-        for col in range(table.columnCount()):
-            item = table.item(row, col)
-            if item and text in item.text().lower():
-                visible = True
-                break
-        table.setRowHidden(row, not visible)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Keeps a parent whenever one of its children is accepted
+        self.setRecursiveFilteringEnabled(True)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if super().filterAcceptsRow(source_row, source_parent):
+            return True
+        return (source_parent.isValid()
+                and super().filterAcceptsRow(source_parent.row(), source_parent.parent()))
 
 
 def inject_search_bar(layout, widget, placeholder="Filter..."):
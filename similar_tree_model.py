@@ -0,0 +1,115 @@
+# This Python file uses the following encoding: utf-8
+
+"""
+SimilarTreeModel - two-level model for the Similar Files / Similar Tags trees.
+
+Replaces the QTreeWidget that held one QTreeWidgetItem per rule/tag and
+per file. Rows are plain tuples grouped under their parent row, and a
+repopulate is a single model reset, so a selection change costs a few
+Python lists instead of thousands of item objects and insert
+notifications.
+"""
+
+from typing import List, Sequence, Tuple
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+# (column 0 text, column 1 text, column 0 tooltip, column 1 tooltip,
+#  UserRole value on column 0)
+TreeRow = Tuple[str, str, str, str, object]
+# (top-level row, its child rows)
+TreeGroup = Tuple[TreeRow, Sequence[TreeRow]]
+
+_DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+_TOOLTIP_ROLE = Qt.ItemDataRole.ToolTipRole
+_USER_ROLE = Qt.ItemDataRole.UserRole
+
+# internalId of top-level indexes; a child's internalId is its group row + 1
+_TOP_LEVEL = 0
+
+
+class SimilarTreeModel(QAbstractItemModel):
+    """Read-only two-column tree: top-level rows, each with child rows.
+
+    DisplayRole and ToolTipRole come from the row tuples; UserRole on
+    column 0 is the row's last field (a file path for file rows).
+    """
+
+    def __init__(self, headers: Tuple[str, str], parent=None):
+        super().__init__(parent)
+        self._headers = headers
+        self._groups: List[TreeRow] = []
+        self._children: List[Sequence[TreeRow]] = []
+
+    # ─── Qt model interface ──────────────────────────────────────────────
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid():
+            if parent.internalId() != _TOP_LEVEL:
+                return QModelIndex()
+            group = parent.row()
+            if 0 <= row < len(self._children[group]) and 0 <= column < 2:
+                return self.createIndex(row, column, group + 1)
+            return QModelIndex()
+        if 0 <= row < len(self._groups) and 0 <= column < 2:
+            return self.createIndex(row, column, _TOP_LEVEL)
+        return QModelIndex()
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        group_id = index.internalId()
+        if group_id == _TOP_LEVEL:
+            return QModelIndex()
+        return self.createIndex(group_id - 1, 0, _TOP_LEVEL)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if not parent.isValid():
+            return len(self._groups)
+        if parent.internalId() == _TOP_LEVEL and parent.column() == 0:
+            return len(self._children[parent.row()])
+        return 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 2
+
+    def data(self, index: QModelIndex, role: int = _DISPLAY_ROLE):
+        if not index.isValid():
+            return None
+        group_id = index.internalId()
+        if group_id == _TOP_LEVEL:
+            row = self._groups[index.row()]
+        else:
+            row = self._children[group_id - 1][index.row()]
+        col = index.column()
+        if role == _DISPLAY_ROLE:
+            return row[col]
+        if role == _TOOLTIP_ROLE:
+            return row[2 + col] or None
+        if role == _USER_ROLE and col == 0:
+            return row[4]
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = _DISPLAY_ROLE):
+        if (role == _DISPLAY_ROLE
+                and orientation == Qt.Orientation.Horizontal
+                and 0 <= section < 2):
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    # ─── Population ──────────────────────────────────────────────────────
+
+    def set_groups(self, groups: Sequence[TreeGroup]) -> None:
+        """Replace the tree contents with *groups* in one reset."""
+        self.beginResetModel()
+        self._groups = [group for group, _ in groups]
+        self._children = [children for _, children in groups]
+        self.endResetModel()
+
+    def set_message(self, text: str, tooltip: str = "") -> None:
+        """Show a single placeholder row (e.g. "No tags found")."""
+        self.set_groups([((text, "", tooltip, "", None), ())])
+
+    def clear(self) -> None:
+        self.set_groups(())
@@ -300,6 +300,9 @@ class ThemeManager:
         # All themes are now loaded from JSON
         self.all_themes: Dict[str, ThemeSettings] = {}
         self.current_theme: ThemeSettings = None
+        # Generated QSS per theme name, with the theme object it was built
+        # from (save_theme/load_all_themes replace the object)
+        self._qss_cache: Dict[str, Tuple[ThemeSettings, str]] = {}
         
         self.load_all_themes()
     
@@ -396,10 +399,18 @@ class ThemeManager:
         )
     
     def generate_qss_stylesheet(self, theme: ThemeSettings = None) -> str:
-        """Generate complete QSS stylesheet from theme"""
+        """Generate complete QSS stylesheet from theme (cached per theme)"""
         if theme is None:
             theme = self.current_theme
 
+        cached = self._qss_cache.get(theme.name)
+        if cached is not None and cached[0] is theme:
+            return cached[1]
+        stylesheet = self._build_qss_stylesheet(theme)
+        self._qss_cache[theme.name] = (theme, stylesheet)
+        return stylesheet
+
+    def _build_qss_stylesheet(self, theme: ThemeSettings) -> str:
         colors = theme.colors
         sb_handle, sb_hover = ensure_scrollbar_contrast(
             colors.scrollbar_background,
@@ -19,9 +19,9 @@ from PySide6.QtGui import (QAction, QBrush, QColor, QConicalGradient,
 from PySide6.QtWidgets import (QApplication, QHBoxLayout, QHeaderView, QListWidget,
     QListWidgetItem, QMainWindow, QMenuBar, QPushButton,
     QSizePolicy, QSpacerItem, QSplitter, QStatusBar,
-    QTabWidget, QTableView, QTableWidget, QTableWidgetItem,
-    QTextBrowser, QTextEdit, QTreeWidget, QTreeWidgetItem,
-    QVBoxLayout, QWidget)
+    QTabWidget, QTableView,
+    QTextBrowser, QTextEdit, QTreeView, QTreeWidget,
+    QTreeWidgetItem, QVBoxLayout, QWidget)
 
 class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
@@ -172,10 +172,7 @@ class Ui_MainWindow(object):
         self.tab_2.setObjectName(u"tab_2")
         self.horizontalLayout_8 = QHBoxLayout(self.tab_2)
         self.horizontalLayout_8.setObjectName(u"horizontalLayout_8")
-        self.tw_similar_files = QTreeWidget(self.tab_2)
-        __qtreewidgetitem1 = QTreeWidgetItem()
-        __qtreewidgetitem1.setText(0, u"1");
-        self.tw_similar_files.setHeaderItem(__qtreewidgetitem1)
+        self.tw_similar_files = QTreeView(self.tab_2)
         self.tw_similar_files.setObjectName(u"tw_similar_files")
 
         self.horizontalLayout_8.addWidget(self.tw_similar_files)
@@ -185,10 +182,7 @@ class Ui_MainWindow(object):
         self.tab_similar_tag.setObjectName(u"tab_similar_tag")
         self.horizontalLayout_2 = QHBoxLayout(self.tab_similar_tag)
         self.horizontalLayout_2.setObjectName(u"horizontalLayout_2")
-        self.tw_similar_tags = QTreeWidget(self.tab_similar_tag)
-        __qtreewidgetitem2 = QTreeWidgetItem()
-        __qtreewidgetitem2.setText(0, u"1");
-        self.tw_similar_tags.setHeaderItem(__qtreewidgetitem2)
+        self.tw_similar_tags = QTreeView(self.tab_similar_tag)
         self.tw_similar_tags.setObjectName(u"tw_similar_tags")
 
         self.horizontalLayout_2.addWidget(self.tw_similar_tags)
@@ -202,7 +196,7 @@ class Ui_MainWindow(object):
         self.tab.setObjectName(u"tab")
         self.horizontalLayout_6 = QHBoxLayout(self.tab)
         self.horizontalLayout_6.setObjectName(u"horizontalLayout_6")
-        self.tw_yara_match_details = QTableWidget(self.tab)
+        self.tw_yara_match_details = QTableView(self.tab)
         self.tw_yara_match_details.setObjectName(u"tw_yara_match_details")
 
         self.horizontalLayout_6.addWidget(self.tw_yara_match_details)
@@ -6,18 +6,23 @@ highlighting, cursor position reporting, word wrap toggle, monospace font setup,
 and optional vim-style keybindings.
 """
 
+from bisect import bisect_left
 import re
 
-from PySide6.QtCore import QRect, QSize, Qt, QTimer, Signal
+from PySide6.QtCore import QPointF, QRect, QSize, Qt, QTimer, Signal
 from PySide6.QtCore import QMimeData
 from PySide6.QtCore import QEvent
-from PySide6.QtGui import (QColor, QFont, QPainter, QPen, QTextCharFormat,
-                           QTextCursor, QTextFormat)
+from PySide6.QtGui import (QColor, QFont, QPainter, QPen, QPixmap, QStaticText,
+                           QTextCharFormat, QTextCursor, QTextFormat)
 from PySide6.QtWidgets import QApplication, QTextEdit, QToolTip, QWidget
 
 from vim_handler import VimHandler, VimMode
 from yara_completer import CompletionEngine, CompletionPopup
 
+_LINE_NUMBER_ALIGN = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop
+# Upper bound on cached QStaticText line numbers per font
+_STATIC_NUMBER_LIMIT = 4096
+
 
 class _LineNumberArea(QWidget):
     """Widget that paints line numbers alongside the editor."""
@@ -44,6 +49,8 @@ class YaraTextEdit(QTextEdit):
 
         self._theme_manager = None
         self.word_wrap_enabled = False
+        self._font_spec: tuple | None = None  # (family, size) from setup_font
+        self._zoom_font_size = 0
 
         # --- Vim handler ---
         self._vim_handler = VimHandler(self, parent=self)
@@ -104,18 +111,55 @@ class YaraTextEdit(QTextEdit):
 
         # --- Line number area ---
         self.line_number_area = _LineNumberArea(self)
+        # Colours/metrics for painting it; rebuilt lazily after theme,
+        # palette or font changes (see _refresh_line_number_palette)
+        self._ln_palette_cache: dict | None = None
+        # Rendered number strip for the current scroll position; repaints
+        # that only move the cursor (or scroll horizontally) blit it and
+        # overlay the current line. Dropped on any document change.
+        self._gutter_pixmap: QPixmap | None = None
+        self._gutter_key: tuple | None = None
+        self._gutter_rows: dict[int, tuple[int, int]] = {}
+        # Gutter width per digit count for the current font (font changes
+        # clear it), and the margin last handed to setViewportMargins
+        self._ln_width_cache: dict[int, int] = {}
+        self._ln_margin = -1
+        # Word-wrap status bar: _visual_prefix[i] is the number of visual
+        # lines in blocks 0..i-1; entries from block _visual_dirty_from on
+        # are stale and rebuilt on demand (see _visual_lines_before)
+        self._visual_prefix: list[int] = [0]
+        self._visual_dirty_from = 0
+
+        # Gutter width/repaint after edits, coalesced so a burst of
+        # textChanged signals (paste, undo, replace-all) refreshes once
+        self._gutter_refresh_timer = QTimer(self)
+        self._gutter_refresh_timer.setSingleShot(True)
+        self._gutter_refresh_timer.setInterval(0)
+        self._gutter_refresh_timer.timeout.connect(self._refresh_gutter)
 
         # Connect signals
-        self.textChanged.connect(self._update_line_number_area_width)
-        self.textChanged.connect(lambda: self.line_number_area.update())
-        self.verticalScrollBar().valueChanged.connect(lambda: self.line_number_area.update())
-        self.horizontalScrollBar().valueChanged.connect(lambda: self.line_number_area.update())
+        self.textChanged.connect(self._gutter_refresh_timer.start)
+        # Repaint requests go straight to the C++ update() slot; Qt merges
+        # them into one gutter paint per event-loop pass. The gutter does
+        # not depend on horizontal scrolling, so that bar isn't connected.
+        self.verticalScrollBar().valueChanged.connect(self.line_number_area.update)
         self.cursorPositionChanged.connect(self._highlight_current_line)
         self.cursorPositionChanged.connect(self._show_line_column)
-        self.cursorPositionChanged.connect(lambda: self.line_number_area.update())
-
-        # Palette changes (theme switching)
-        QApplication.instance().paletteChanged.connect(self._on_font_or_theme_change)
+        self.cursorPositionChanged.connect(self.line_number_area.update)
+
+        # Palette changes (theme switching); the OS can emit a burst of
+        # these during a theme transition, so they are coalesced
+        self._palette_timer = QTimer(self)
+        self._palette_timer.setSingleShot(True)
+        self._palette_timer.setInterval(50)
+        self._palette_timer.timeout.connect(self._on_font_or_theme_change)
+        QApplication.instance().paletteChanged.connect(self._palette_timer.start)
+
+        document.contentsChanged.connect(self._invalidate_gutter)
+        document.contentsChange.connect(self._on_contents_change)
+        document.documentLayout().documentSizeChanged.connect(self._invalidate_visual_prefix)
+        document.blockCountChanged.connect(self._invalidate_gutter)
+        document.documentLayout().documentSizeChanged.connect(self._invalidate_gutter)
 
         # Document layout changes for word-wrap responsiveness
         if hasattr(self.document(), 'documentLayoutChanged'):
@@ -134,6 +178,8 @@ class YaraTextEdit(QTextEdit):
         self._completion_popup.set_theme_manager(theme_manager)
         self._apply_scrollbar_style()
         self._highlight_current_line()
+        self._ln_palette_cache = None
+        self._gutter_pixmap = None
         self.line_number_area.update()
 
     def set_vim_mode(self, enabled: bool):
@@ -254,6 +300,11 @@ class YaraTextEdit(QTextEdit):
 
     def setup_font(self, family: str = "Consolas", size: int = 8):
         """Configure monospace font for the editor."""
+        # Theme switches re-apply the same font; skip the document relayout
+        # unless the family/size changed or the user has zoomed since
+        if self._font_spec == (family, size) and self._zoom_font_size == size:
+            return
+        self._font_spec = (family, size)
         self._zoom_font_size = size
         font = QFont(family, size)
         self.setFont(font)
@@ -292,10 +343,9 @@ class YaraTextEdit(QTextEdit):
             self.setLineWrapMode(QTextEdit.LineWrapMode.WidgetWidth)
             self.word_wrap_enabled = True
 
-        # Force responsive updates
+        # setLineWrapMode() relayouts the document itself; only the gutter
+        # margin and the repaints below are needed here
         self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
-        doc = self.document()
-        doc.setModified(doc.isModified())
 
         cursor.setPosition(cursor_position)
         self.setTextCursor(cursor)
@@ -313,8 +363,6 @@ class YaraTextEdit(QTextEdit):
 
     def refresh_word_wrap_display(self):
         """Force refresh of word wrap display and line numbers."""
-        doc = self.document()
-        doc.setModified(doc.isModified())
         self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
         self.line_number_area.update()
         self.viewport().update()
@@ -392,11 +440,10 @@ class YaraTextEdit(QTextEdit):
     # ─── Line number area ────────────────────────────────────────────────
 
     def line_number_area_width(self) -> int:
-        digits = 1
-        count = max(1, self.document().blockCount())
-        while count >= 10:
-            count //= 10
-            digits += 1
+        digits = len(str(max(1, self.document().blockCount())))
+        width = self._ln_width_cache.get(digits)
+        if width is not None:
+            return width
 
         fm = self.fontMetrics()
         digit_width = fm.horizontalAdvance('9')
@@ -404,10 +451,20 @@ class YaraTextEdit(QTextEdit):
         font_size_padding = max(4, fm.height() // 4)
         left_padding = base_padding + font_size_padding
         right_padding = 8 + font_size_padding // 2
-        return left_padding + (digit_width * digits) + right_padding
+        width = left_padding + (digit_width * digits) + right_padding
+        self._ln_width_cache[digits] = width
+        return width
+
+    def _refresh_gutter(self):
+        self._update_line_number_area_width()
+        self.line_number_area.update()
 
     def _update_line_number_area_width(self):
-        self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
+        # textChanged fires per keystroke; only relayout when the width moves
+        width = self.line_number_area_width()
+        if width != self._ln_margin:
+            self._ln_margin = width
+            self.setViewportMargins(width, 0, 0, 0)
 
     def _highlight_current_line(self):
         """Update all extra selections: current-line + diagnostics."""
@@ -474,91 +531,149 @@ class YaraTextEdit(QTextEdit):
         self._diagnostics = diagnostics
         self._highlight_current_line()
 
-    def _line_number_area_paint_event(self, event):
-        painter = QPainter(self.line_number_area)
-        try:
-            # --- Determine colors ---
-            if self._theme_manager and self._theme_manager.current_theme:
-                colors = self._theme_manager.current_theme.colors
-                line_bg = QColor(colors.editor_line_number_bg)
-                text_color = QColor(colors.editor_line_number_text)
-                current_line_color = QColor(colors.editor_current_line)
-                current_text_color = QColor(colors.editor_text)
-                separator_color = QColor(colors.primary)
+    def _refresh_line_number_palette(self) -> dict:
+        """Compute (and cache) everything the line number painter needs."""
+        if self._theme_manager and self._theme_manager.current_theme:
+            colors = self._theme_manager.current_theme.colors
+            line_bg = QColor(colors.editor_line_number_bg)
+            text_color = QColor(colors.editor_line_number_text)
+            current_line_color = QColor(colors.editor_current_line)
+            current_text_color = QColor(colors.editor_text)
+            separator_color = QColor(colors.primary)
+        else:
+            palette = QApplication.palette()
+            bg_color = palette.color(palette.ColorRole.Base)
+            if bg_color.lightness() > 128:
+                line_bg = bg_color.darker(105)
+                text_color = palette.color(palette.ColorRole.Text).lighter(150)
+                current_line_color = QColor(240, 240, 240, 120)
+                current_text_color = palette.color(palette.ColorRole.Text)
             else:
-                palette = QApplication.palette()
-                bg_color = palette.color(palette.ColorRole.Base)
-                if bg_color.lightness() > 128:
-                    line_bg = bg_color.darker(105)
-                    text_color = palette.color(palette.ColorRole.Text).lighter(150)
-                    current_line_color = QColor(240, 240, 240, 120)
-                    current_text_color = palette.color(palette.ColorRole.Text)
-                else:
-                    line_bg = bg_color.lighter(115)
-                    text_color = palette.color(palette.ColorRole.Text).darker(150)
-                    current_line_color = QColor(80, 80, 80, 120)
-                    current_text_color = palette.color(palette.ColorRole.Text)
-                separator_color = text_color
-
-            painter.fillRect(event.rect(), line_bg)
+                line_bg = bg_color.lighter(115)
+                text_color = palette.color(palette.ColorRole.Text).darker(150)
+                current_line_color = QColor(80, 80, 80, 120)
+                current_text_color = palette.color(palette.ColorRole.Text)
+            separator_color = text_color
+
+        # Bold font for the current line number
+        bold_font = QFont(self.line_number_area.font())
+        bold_font.setBold(True)
+
+        self._ln_palette_cache = {
+            'line_bg': line_bg,
+            'text_pen': QPen(text_color),
+            'wrap_marker_pen': QPen(text_color.darker(150)),
+            'current_line_color': current_line_color,
+            'current_text_color': current_text_color,
+            'separator_pen': QPen(separator_color, 1),
+            'bold_font': bold_font,
+            'font_height': self.fontMetrics().height(),
+            'document_margin': self.document().documentMargin(),
+            # Laid-out line number strings (see _line_number_text)
+            'static_numbers': {},
+        }
+        return self._ln_palette_cache
+
+    def _line_number_text(self, number: int, cache: dict) -> QStaticText:
+        """Prepared QStaticText for *number*, reused across renders."""
+        numbers = cache['static_numbers']
+        static = numbers.get(number)
+        if static is None:
+            if len(numbers) >= _STATIC_NUMBER_LIMIT:
+                numbers.clear()
+            static = QStaticText(str(number))
+            static.setTextFormat(Qt.TextFormat.PlainText)
+            static.prepare(font=self.line_number_area.font())
+            numbers[number] = static
+        return static
+
+    def _invalidate_gutter(self):
+        self._gutter_pixmap = None
+
+    def _draw_wrap_markers(self, painter: QPainter, block, adjusted_y: int,
+                           block_height: int, width: int, cache: dict):
+        layout = block.layout()
+        if not layout or layout.lineCount() <= 1:
+            return
+        font_height = cache['font_height']
+        top = adjusted_y + cache['document_margin']
+        # A long wrapped block can have thousands of visual lines; only the
+        # ones inside the gutter get a marker. Skip (binary search) those
+        # above its top edge and stop at the bottom one.
+        line_count = layout.lineCount()
+        first = 1 + bisect_left(range(1, line_count), -font_height - top,
+                                key=lambda vi: layout.lineAt(vi).y())
+        bottom = min(top + block_height, self.line_number_area.height())
+        right_margin = max(5, width // 10)
+        painter.setFont(self.line_number_area.font())
+        painter.setPen(cache['wrap_marker_pen'])
+        for vi in range(first, line_count):
+            cy = top + layout.lineAt(vi).y()
+            if cy >= bottom:
+                break
+            painter.drawText(
+                0, int(cy), width - right_margin, font_height,
+                _LINE_NUMBER_ALIGN, "\u2219"
+            )
 
-            doc = self.document()
-            width = self.line_number_area.width()
-            font_height = self.fontMetrics().height()
-            current_cursor_line = self.textCursor().blockNumber()
+    def _render_gutter(self, width: int, height: int, cache: dict) -> QPixmap:
+        """Render background, line numbers and separator for the viewport.
 
-            # Prepare bold font for current line number
-            original_font = painter.font()
-            bold_font = QFont(original_font)
-            bold_font.setBold(True)
+        Records each visible block's (y, height) in ``_gutter_rows`` so the
+        current line can be overlaid without another layout walk.
+        """
+        dpr = self.line_number_area.devicePixelRatioF()
+        pixmap = QPixmap(int(width * dpr), int(height * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(cache['line_bg'])
+
+        text_pen = cache['text_pen']
+        document_margin = cache['document_margin']
+        number_right = width - max(5, width // 10)
+        # Without word wrap every block is a single line, so the per-block
+        # layout lookups for continuation markers are skipped outright
+        word_wrap = self.word_wrap_enabled
+        rows = {}
+
+        painter = QPainter(pixmap)
+        try:
+            painter.setFont(self.line_number_area.font())
+            painter.setPen(text_pen)
 
+            doc = self.document()
+            layout_engine = doc.documentLayout()
             viewport_top = self.verticalScrollBar().value()
-            viewport_bottom = viewport_top + self.viewport().height()
-
-            block = doc.firstBlock()
-            block_number = 0
-            y_position = 0
+            viewport_bottom = viewport_top + height
+
+            # Start at the block under the top edge of the viewport instead
+            # of walking every block above it; y is relative to the first
+            # block so rows line up exactly as with a walk from the top
+            first_top = layout_engine.blockBoundingRect(doc.firstBlock()).top()
+            position = layout_engine.hitTest(QPointF(0, viewport_top),
+                                             Qt.HitTestAccuracy.FuzzyHit)
+            block = doc.findBlock(max(0, position))
+            block_number = block.blockNumber()
+            y_position = int(layout_engine.blockBoundingRect(block).top() - first_top)
 
             while block.isValid():
                 if block.isVisible():
-                    block_height = int(doc.documentLayout().blockBoundingRect(block).height())
+                    block_height = int(layout_engine.blockBoundingRect(block).height())
 
-                    if y_position + block_height >= viewport_top and y_position <= viewport_bottom:
+                    if y_position + block_height >= viewport_top:
                         adjusted_y = y_position - viewport_top
+                        rows[block_number] = (adjusted_y, block_height)
+
+                        static = self._line_number_text(block_number + 1, cache)
+                        painter.drawStaticText(
+                            QPointF(number_right - static.size().width(),
+                                    int(adjusted_y + document_margin)),
+                            static
+                        )
 
-                        if (adjusted_y + block_height >= event.rect().top() and
-                                adjusted_y <= event.rect().bottom()):
-
-                            if block_number == current_cursor_line:
-                                painter.fillRect(0, adjusted_y, width, block_height, current_line_color)
-                                painter.setPen(current_text_color)
-                                painter.setFont(bold_font)
-                            else:
-                                painter.setPen(text_color)
-                                painter.setFont(original_font)
-
-                            number = str(block_number + 1)
-                            right_margin = max(5, width // 10)
-                            document_margin = doc.documentMargin()
-                            text_top_y = adjusted_y + document_margin
-
-                            painter.drawText(
-                                0, int(text_top_y), width - right_margin, font_height,
-                                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop, number
-                            )
-
-                            if (self.word_wrap_enabled and block.layout() and block.layout().lineCount() > 1):
-                                painter.setFont(original_font)
-                                painter.setPen(text_color.darker(150))
-                                layout = block.layout()
-                                for vi in range(1, layout.lineCount()):
-                                    line = layout.lineAt(vi)
-                                    cy = adjusted_y + line.y() + document_margin
-                                    if cy < adjusted_y + block_height + document_margin:
-                                        painter.drawText(
-                                            0, int(cy), width - right_margin, font_height,
-                                            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop, "\u2219"
-                                        )
+                        if word_wrap:
+                            self._draw_wrap_markers(painter, block, adjusted_y,
+                                                    block_height, width, cache)
+                            painter.setPen(text_pen)
 
                     y_position += block_height
                     if y_position > viewport_bottom:
@@ -567,11 +682,46 @@ class YaraTextEdit(QTextEdit):
                 block = block.next()
                 block_number += 1
 
-            # Restore font, then draw separator line
-            painter.setFont(original_font)
-            pen = QPen(separator_color, 1)
-            painter.setPen(pen)
-            painter.drawLine(width - 1, event.rect().top(), width - 1, event.rect().bottom())
+            painter.setPen(cache['separator_pen'])
+            painter.drawLine(width - 1, 0, width - 1, height)
+        finally:
+            painter.end()
+
+        self._gutter_rows = rows
+        return pixmap
+
+    def _line_number_area_paint_event(self, event):
+        cache = self._ln_palette_cache or self._refresh_line_number_palette()
+        width = self.line_number_area.width()
+        height = self.line_number_area.height()
+
+        key = (self.verticalScrollBar().value(), width, height,
+               self.viewport().width(), self.word_wrap_enabled)
+        if self._gutter_pixmap is None or self._gutter_key != key:
+            self._gutter_pixmap = self._render_gutter(width, height, cache)
+            self._gutter_key = key
+
+        painter = QPainter(self.line_number_area)
+        try:
+            painter.drawPixmap(0, 0, self._gutter_pixmap)
+
+            # Overlay the current line (highlight + bold number)
+            block = self.textCursor().block()
+            row = self._gutter_rows.get(block.blockNumber())
+            if row is not None:
+                adjusted_y, block_height = row
+                painter.fillRect(0, adjusted_y, width - 1, block_height, cache['line_bg'])
+                painter.fillRect(0, adjusted_y, width - 1, block_height, cache['current_line_color'])
+                painter.setPen(cache['current_text_color'])
+                painter.setFont(cache['bold_font'])
+                painter.drawText(
+                    0, int(adjusted_y + cache['document_margin']),
+                    width - max(5, width // 10), cache['font_height'],
+                    _LINE_NUMBER_ALIGN, str(block.blockNumber() + 1)
+                )
+                if self.word_wrap_enabled:
+                    self._draw_wrap_markers(painter, block, adjusted_y,
+                                            block_height, width, cache)
         finally:
             painter.end()
 
@@ -588,15 +738,7 @@ class YaraTextEdit(QTextEdit):
                     relative_pos = cursor.positionInBlock()
                     visual_line_in_block = layout.lineForTextPosition(relative_pos).lineNumber()
 
-                    total_visual_lines = 0
-                    current_block = self.document().firstBlock()
-                    while current_block.isValid() and current_block.blockNumber() < logical_line - 1:
-                        if current_block.layout():
-                            total_visual_lines += current_block.layout().lineCount()
-                        else:
-                            total_visual_lines += 1
-                        current_block = current_block.next()
-
+                    total_visual_lines = self._visual_lines_before(logical_line - 1)
                     visual_line = total_visual_lines + visual_line_in_block + 1
                     self.cursor_info_changed.emit(f"Line: {visual_line} (Block: {logical_line}), Column: {col}")
                 else:
@@ -606,6 +748,32 @@ class YaraTextEdit(QTextEdit):
         else:
             self.cursor_info_changed.emit(f"Line: {logical_line}, Column: {col}")
 
+    def _on_contents_change(self, position: int, removed: int, added: int):
+        block_number = self.document().findBlock(position).blockNumber()
+        if block_number < self._visual_dirty_from:
+            self._visual_dirty_from = max(0, block_number)
+
+    def _invalidate_visual_prefix(self):
+        # Reflow (resize, font, wrap toggle, deferred layout) can change
+        # the line count of any block
+        self._visual_dirty_from = 0
+
+    def _visual_lines_before(self, block_number: int) -> int:
+        """Visual (wrapped) lines in all blocks before *block_number*."""
+        prefix = self._visual_prefix
+        if block_number >= self._visual_dirty_from:
+            start = self._visual_dirty_from
+            del prefix[start + 1:]
+            total = prefix[start]
+            block = self.document().findBlockByNumber(start)
+            while block.isValid():
+                layout = block.layout()
+                total += layout.lineCount() if layout else 1
+                prefix.append(total)
+                block = block.next()
+            self._visual_dirty_from = len(prefix)
+        return prefix[block_number]
+
     # ─── Overrides ───────────────────────────────────────────────────────
 
     # ─── Auto-pair / auto-indent constants ──────────────────────────────
@@ -1056,10 +1224,22 @@ class YaraTextEdit(QTextEdit):
     def _responsive_update(self):
         self._update_line_number_area_width()
         self.line_number_area.update()
-        doc = self.document()
-        doc.setModified(doc.isModified())
+
+    def changeEvent(self, event):
+        # Font (zoom, setup_font) and palette changes invalidate the
+        # cached line number colours/metrics
+        if event.type() in (QEvent.Type.FontChange, QEvent.Type.PaletteChange):
+            self._ln_palette_cache = None
+            self._gutter_pixmap = None
+            # Assigned rather than cleared: style/palette setup in __init__
+            # delivers these events before the cache attributes exist
+            self._ln_width_cache = {}
+        super().changeEvent(event)
 
     def _on_font_or_theme_change(self):
+        self._ln_palette_cache = None
+        self._gutter_pixmap = None
+        self._ln_width_cache.clear()
         self._update_line_number_area_width()
         self._apply_scrollbar_style()
         self.line_number_area.update()
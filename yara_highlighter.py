@@ -1,10 +1,13 @@
+import importlib.util
+
 from PySide6.QtCore import QRegularExpression
 from PySide6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
 
-# Check if yaraast is available for AST-based highlighting
+# Check if yaraast's parser is available for AST-based highlighting
+# (imported lazily in parse_yara_ast). find_spec imports the parent
+# packages, and raises if they are missing.
 try:
-    from yaraast.parser.better_parser import Parser
-    YARAAST_AVAILABLE = True
+    YARAAST_AVAILABLE = importlib.util.find_spec("yaraast.parser.better_parser") is not None
 except ImportError:
     YARAAST_AVAILABLE = False
 
@@ -190,6 +193,7 @@ class YaraHighlighter(QSyntaxHighlighter):
 
     def parse_yara_ast(self, full_text: str):
         """Parse YARA text to AST - AST ONLY mode, no fallbacks."""
+        global YARAAST_AVAILABLE
         if not YARAAST_AVAILABLE:
             return None
             
@@ -210,6 +214,13 @@ class YaraHighlighter(QSyntaxHighlighter):
             self._cached_ast is not None):
             return self._cached_ast
             
+        try:
+            from yaraast.parser.better_parser import Parser
+        except ImportError:
+            # Found but not importable: behave as if yaraast were missing
+            YARAAST_AVAILABLE = False
+            return None
+
         try:
             parser = Parser()
             ast = parser.parse(full_text)